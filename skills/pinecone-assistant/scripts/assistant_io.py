@@ -0,0 +1,143 @@
+"""
+Content-digest, retry and processing-status helpers shared by sync.py and upload.py.
+
+Not a CLI: the scripts import it from their own directory (uv run puts a
+script's directory on sys.path), so both classify errors the same way and
+store the same 'content_hash', recognising each other's uploads.
+
+Only requests are retried: throttling (429), server errors (5xx) and
+connection or timeout failures. A file that fails server-side processing is
+a ProcessingFailed, never retried — uploading it again only leaves another
+failed copy in the assistant — so callers upload with upload_file (timeout=-1)
+and wait with wait_until_available, which knows the file ID to clean up.
+"""
+
+import time
+import random
+import hashlib
+
+try:
+    from pinecone import PineconeConnectionError
+except ImportError:  # pinecone < 9 surfaces network failures as ConnectionError / urllib3 errors
+    PineconeConnectionError = ConnectionError
+
+# Content digest stored in each file's metadata. BLAKE2b is in the stdlib and
+# hashes faster than SHA-256; the prefix leaves room to change algorithms.
+DIGEST_PREFIX = "blake2b:"
+HASH_CHUNK_BYTES = 1 << 20
+
+# Retry backoff for throttled / 5xx requests: full jitter over an exponential
+# ceiling, so workers that were throttled together don't retry together.
+RETRY_BASE_S = 1.0
+RETRY_CAP_S = 30.0
+
+# Polling a file while it is processing: fast at first, backing off.
+POLL_FIRST_S = 0.5
+POLL_MAX_S = 5.0
+
+
+class ProcessingFailed(Exception):
+    """A file was uploaded but the assistant could not process it."""
+
+    def __init__(self, file_id: str, reason: str):
+        super().__init__(f"processing failed: {reason}")
+        self.file_id = file_id
+
+
+def hash_file(file_path) -> str:
+    """Content digest of a file, as stored in the 'content_hash' metadata key."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return DIGEST_PREFIX + digest.hexdigest()
+
+
+def error_status(exc: BaseException):
+    """HTTP status of an SDK error, if it carries one."""
+    return getattr(exc, "status_code", None) or getattr(exc, "status", None)
+
+
+def is_transient(exc: BaseException) -> bool:
+    """True for failures worth retrying: throttling (429), server errors (5xx), network trouble.
+
+    Anything else — any other 4xx, a missing local file, a processing failure —
+    fails the same way on every attempt.
+    """
+    status = error_status(exc)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return isinstance(exc, (TimeoutError, ConnectionError, PineconeConnectionError))
+
+
+def with_retries(fn, retries: int):
+    """Call `fn`, retrying transient failures up to `retries` times with jittered backoff.
+
+    `fn` should be a single request: don't wrap a wait for processing, whose
+    timeout would otherwise re-run the upload.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == retries or not is_transient(e):
+                raise
+            time.sleep(random.uniform(0, min(RETRY_CAP_S, RETRY_BASE_S * 2 ** attempt)))
+
+
+def find_upload(asst, metadata: dict, retries: int):
+    """The remote copy carrying exactly this upload's `file_path` and `uploaded_at` stamp, or None."""
+    stamp = {"file_path": metadata["file_path"], "uploaded_at": metadata["uploaded_at"]}
+    files = with_retries(lambda: asst.list_files(filter={k: {"$eq": v} for k, v in stamp.items()}), retries)
+    for f in files:
+        remote = getattr(f, "metadata", None) or {}
+        if all(remote.get(k) == v for k, v in stamp.items()):
+            return f
+    return None
+
+
+def upload_file(asst, file_path: str, metadata: dict, retries: int):
+    """Upload a file with timeout=-1, retrying transient failures without leaving a second copy.
+
+    `asst.upload_file` POSTs the file and then describes it, and a timed-out
+    POST may still have landed; re-running it blindly would upload again. So
+    before each retry this looks for the copy an earlier attempt created —
+    matched by `metadata`'s `file_path` and per-upload `uploaded_at` stamp —
+    and returns it instead.
+    """
+    for attempt in range(retries + 1):
+        if attempt:
+            existing = find_upload(asst, metadata, retries)
+            if existing is not None:
+                return existing
+        try:
+            return asst.upload_file(file_path=file_path, metadata=metadata, timeout=-1)
+        except Exception as e:
+            if attempt == retries or not is_transient(e):
+                raise
+            time.sleep(random.uniform(0, min(RETRY_CAP_S, RETRY_BASE_S * 2 ** attempt)))
+
+
+def file_status(f) -> str:
+    return (getattr(f, "status", None) or "").lower()
+
+
+def wait_until_available(asst, file_id: str, timeout_s: float | None, retries: int):
+    """Poll a file until it is Available and return it.
+
+    Raises ProcessingFailed if processing fails, TimeoutError if `timeout_s`
+    (None: no limit) passes first.
+    """
+    deadline = None if timeout_s is None else time.monotonic() + timeout_s
+    delay = POLL_FIRST_S
+    while True:
+        f = with_retries(lambda: asst.describe_file(file_id=file_id), retries)
+        status = file_status(f)
+        if status == "available":
+            return f
+        if status == "processingfailed":
+            raise ProcessingFailed(file_id, getattr(f, "error_message", None) or "no reason given")
+        if deadline is not None and time.monotonic() + delay > deadline:
+            raise TimeoutError(f"still {getattr(f, 'status', 'processing')} after {timeout_s:.0f}s")
+        time.sleep(delay)
+        delay = min(delay * 2, POLL_MAX_S)
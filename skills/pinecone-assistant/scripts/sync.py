@@ -10,25 +10,71 @@
 Sync local files to a Pinecone Assistant, only uploading new or changed files.
 
 Usage:
-    uv run sync.py --assistant NAME --source PATH [--delete-missing] [--dry-run]
+    uv run sync.py --assistant NAME --source PATH [--delete-missing] [--dry-run] [--concurrency N]
+                   [--update-mode swap|replace] [--watch]
 
 Environment Variables:
     PINECONE_API_KEY: Required Pinecone API key
 
 Output:
     Shows files to add, update, and optionally delete, with confirmation prompt
+
+Change detection:
+    Each uploaded file carries a content digest in its metadata ('content_hash').
+    A file whose size and mtime match the remote copy is unchanged; one whose
+    mtime moved but whose content did not (git checkout, CI cache restore) is
+    recognised by its digest and left alone. Digests are cached locally, keyed
+    by (path, inode, mtime, size), so unchanged files are never re-read.
+
+Updates:
+    By default a changed file is swapped: the new version is uploaded, and the
+    old copy is deleted only once the new one is Available, so the path never
+    drops out of retrieval. An interrupted swap can leave two copies of a path;
+    the next sync keeps the newest Available copy and deletes the rest.
+    A new copy that fails server-side processing is deleted and reported as a
+    failure; only request errors (429, 5xx, network) are retried.
+
+Manifest:
+    The assistant's file list (ID, path, digest, status) is kept in a local
+    manifest and updated after every upload and delete, so back-to-back runs
+    plan without calling list_files. The remote listing is re-read when the
+    manifest is older than --reconcile-hours (15 minutes by default, so uploads
+    made by upload.py or the console show up soon), when a previous run was
+    interrupted, or with --refresh; differences are reported as drift. The
+    manifest is kept per project (API key and assistant host), not just per
+    assistant name.
+
+Watch mode:
+    --watch syncs once, then keeps running: file events are debounced into
+    batches and only the touched paths are re-planned and synced. Uses
+    inotify/FSEvents via watchdog when it is installed (uv run --with watchdog),
+    otherwise polls the tree with a local scan every --poll-interval seconds
+    (stretched for trees too large to re-stat that often).
 """
 
 import os
+import json
+import time
 import hashlib
+import threading
+from enum import Enum
+from types import SimpleNamespace
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
 from datetime import datetime, timezone
 import typer
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn, TimeElapsedColumn
 from pinecone import Pinecone
+from assistant_io import ProcessingFailed, error_status, file_status, hash_file, upload_file, wait_until_available, with_retries
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
 
 app = typer.Typer()
 console = Console()
@@ -39,58 +85,774 @@ SUPPORTED_EXTENSIONS = {'.md', '.txt', '.pdf', '.docx', '.json'}
 # Directories to exclude
 EXCLUDE_DIRS = {'node_modules', '.venv', '.git', 'build', 'dist', '__pycache__', '.pytest_cache'}
 
+# Threads listing directories during the local scan; sibling subtrees are
+# walked in parallel, which matters most on network and cold filesystems.
+# Directories this deep or shallower are handed out to the pool; below that a
+# worker walks its subtree itself, since a task per small directory costs more
+# than listing it.
+SCAN_WORKERS = 8
+SCAN_FANOUT_DEPTH = 2
 
-def should_exclude_path(path: Path, source_root: Path) -> bool:
-    """Check if path should be excluded based on directory patterns."""
-    try:
-        rel_path = path.relative_to(source_root)
-        for part in rel_path.parts:
-            if part in EXCLUDE_DIRS or part.startswith('.'):
-                return True
-    except ValueError:
-        return True
-    return False
+# Watch mode: a batch is synced once events have been quiet for --debounce
+# seconds, or after WATCH_MAX_WAIT_S if they never stop.
+WATCH_MAX_WAIT_S = 10.0
 
+# Local digest cache, so unchanged files are stat'ed rather than re-read, and
+# per-assistant manifests of remote files (<assistant>.<scope>.manifest.json).
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'pinecone-assistant'
+DEFAULT_HASH_CACHE = CACHE_DIR / 'sync-hashes.json'
+
+# Watch mode without watchdog re-stats the whole tree on every poll. A tree
+# whose scan takes longer than 1/POLL_MAX_BUSY of --poll-interval is polled
+# less often, so the fallback never keeps more than that share of a CPU busy.
+POLL_MAX_BUSY = 10
 
-def find_files(source_path: Path) -> list[Path]:
-    """Find all supported files in source directory, excluding common build/dependency dirs."""
-    files = []
 
+def scan_dir(path: str):
+    """List one directory: supported files with their stat, and subdirectories worth descending into.
+
+    Excluded and dot directories are pruned here, before anything below them
+    is read. Symlinked directories are not followed.
+    """
+    files, subdirs = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                name = entry.name
+                if name.startswith('.'):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if name not in EXCLUDE_DIRS:
+                            subdirs.append(entry.path)
+                    elif os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS and entry.is_file():
+                        files.append((entry.path, entry.stat()))
+                except OSError:
+                    continue  # removed or unreadable mid-scan
+    except OSError:
+        pass  # permission denied, or the directory went away
+    return files, subdirs
+
+
+def scan_tree(path: str, depth: int):
+    """Walk a directory: its files, plus the subdirectories to hand back to the pool (deeper ones are walked here)."""
+    files, subdirs = scan_dir(path)
+    if depth < SCAN_FANOUT_DEPTH:
+        return files, [(d, depth + 1) for d in subdirs]
+    while subdirs:
+        more_files, more_subdirs = scan_dir(subdirs.pop())
+        files.extend(more_files)
+        subdirs.extend(more_subdirs)
+    return files, []
+
+
+def scan_files(source_path: Path, workers: int = SCAN_WORKERS) -> list[tuple[Path, os.stat_result]]:
+    """Find all supported files under source_path, with the stat taken during the walk."""
     if source_path.is_file():
         if source_path.suffix.lower() in SUPPORTED_EXTENSIONS:
-            return [source_path]
-        else:
-            return []
+            return [(source_path, source_path.stat())]
+        return []
+
+    found = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(scan_tree, str(source_path), 0)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                found.extend(files)
+                pending.update(pool.submit(scan_tree, d, depth) for d, depth in subdirs)
+
+    # Sort by path components (the order Path sorts in) without building Paths to compare.
+    found.sort(key=lambda f: f[0].split(os.sep))
+    return [(Path(p), st) for p, st in found]
+
 
-    for file_path in source_path.rglob('*'):
-        if file_path.is_file():
-            if file_path.suffix.lower() in SUPPORTED_EXTENSIONS:
-                if not should_exclude_path(file_path, source_path):
-                    files.append(file_path)
+def is_excluded(rel_path: str) -> bool:
+    """True for paths under an excluded or dot directory, or dot files — what scan_dir prunes."""
+    return any(part in EXCLUDE_DIRS or part.startswith('.') for part in Path(rel_path).parts)
 
-    return sorted(files)
 
+def find_files(source_path: Path) -> list[Path]:
+    """Find all supported files in source directory, excluding common build/dependency dirs."""
+    return [path for path, _ in scan_files(source_path)]
 
-def get_file_info(file_path: Path):
-    """Get file modification time and size."""
-    stat = file_path.stat()
+
+def get_file_info(file_path: Path, stat: os.stat_result | None = None):
+    """Get file modification time, size and inode (the hash cache key); pass `stat` to skip the syscall."""
+    stat = stat or file_path.stat()
     return {
         'mtime': stat.st_mtime,
+        'mtime_ns': stat.st_mtime_ns,
         'size': stat.st_size,
+        'ino': stat.st_ino,
     }
 
 
-def file_changed(local_info: dict, remote_metadata: dict) -> bool:
-    """Check if local file differs from remote using mtime and size."""
+class HashCache:
+    """Digests of local files, keyed by path and invalidated by any change to (inode, mtime, size).
+
+    Stored as JSON; `save` rewrites it atomically. Entries under `source_root`
+    that weren't looked up this run (deleted or excluded files) are dropped on
+    save; entries for other source trees are kept.
+    """
+
+    def __init__(self, path: Path | None):
+        self.path = path
+        self.entries = {}
+        self.hashed = 0
+        self._used = set()
+        self._lock = threading.Lock()  # digests are taken from sync worker threads
+        if path is not None and path.exists():
+            try:
+                self.entries = json.loads(path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                self.entries = {}  # a corrupt cache only costs a re-hash
+
+    def digest(self, file_path: Path, local_info: dict) -> str:
+        key = str(file_path)
+        stamp = [local_info['ino'], local_info['mtime_ns'], local_info['size']]
+        with self._lock:
+            self._used.add(key)
+            entry = self.entries.get(key)
+            if entry and entry.get('stamp') == stamp:
+                return entry['digest']
+        digest = hash_file(file_path)
+        with self._lock:
+            self.entries[key] = {'stamp': stamp, 'digest': digest}
+            self.hashed += 1
+        return digest
+
+    def save(self, source_root: Path) -> None:
+        if self.path is None:
+            return
+        root = str(source_root)
+        prefix = os.path.join(root, '')  # trailing separator: 'docs' must not prune 'docs-old/...'
+        kept = {k: v for k, v in self.entries.items()
+                if k in self._used or not (k == root or k.startswith(prefix))}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + '.tmp')
+            tmp.write_text(json.dumps(kept), encoding='utf-8')
+            tmp.replace(self.path)
+        except OSError as e:
+            console.print(f"[dim]Could not save hash cache {self.path}: {e}[/dim]")
+
+
+class SyncManifest:
+    """Local record of an assistant's remote files: ID -> name, metadata (path, digest, ...), status.
+
+    A run trusts it instead of calling list_files while it is `fresh`: saved
+    cleanly by a run that finished (or, in watch mode, by the last batch), and
+    reconciled with the remote within `max_age_s`. `mark_dirty` is saved before any change is made, so a run
+    that dies part-way forces the next one to re-list. `scope` (see
+    manifest_scope) must match too, so one file never stands in for a
+    same-named assistant in another project. Called from sync worker
+    threads, hence the lock. With path=None it tracks state but never persists.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path | None, assistant: str, scope: str = ''):
+        self.path = path
+        self.assistant = assistant
+        self.scope = scope
+        self.files = {}
+        self.reconciled_at = 0.0
+        self.clean = False
+        self.loaded = False
+        self._lock = threading.Lock()
+        if path is not None and path.exists():
+            try:
+                data = json.loads(path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                return  # unreadable: start over from a full listing
+            if (data.get('version') == self.VERSION and data.get('assistant') == assistant
+                    and data.get('scope', '') == scope):
+                self.files = data.get('files', {})
+                self.reconciled_at = float(data.get('reconciled_at', 0))
+                self.clean = bool(data.get('clean'))
+                self.loaded = True
+
+    def fresh(self, max_age_s: float) -> bool:
+        return self.loaded and self.clean and time.time() - self.reconciled_at < max_age_s
+
+    @staticmethod
+    def _record(f) -> dict:
+        return {
+            'name': f.name,
+            'metadata': dict(getattr(f, 'metadata', None) or {}),
+            'status': getattr(f, 'status', None),
+            'created_on': getattr(f, 'created_on', None),
+        }
+
+    def remote_files(self) -> list:
+        """The manifest's files, shaped like list_files() results."""
+        with self._lock:
+            return [SimpleNamespace(id=file_id, **record) for file_id, record in self.files.items()]
+
+    def reconcile(self, remote_files: list) -> dict:
+        """Replace the manifest with a fresh listing; return the drift from what it held before.
+
+        Drift is paths added, removed or changed (digest or status) by anyone
+        but this script since the last run. It is only reported when a clean
+        manifest was loaded; otherwise the differences may be our own
+        unrecorded work.
+        """
+        current = {f.id: self._record(f) for f in remote_files}
+        drift = {'added': [], 'removed': [], 'changed': []}
+        if self.loaded and self.clean:
+            for file_id, record in current.items():
+                old = self.files.get(file_id)
+                if old is None:
+                    drift['added'].append(record['metadata'].get('file_path', record['name']))
+                elif (old['status'] != record['status'] or
+                      old['metadata'].get('content_hash') != record['metadata'].get('content_hash')):
+                    drift['changed'].append(record['metadata'].get('file_path', record['name']))
+            for file_id, old in self.files.items():
+                if file_id not in current:
+                    drift['removed'].append(old['metadata'].get('file_path', old['name']))
+        with self._lock:
+            self.files = current
+            self.reconciled_at = time.time()
+            self.loaded = True
+        return drift
+
+    def put(self, f) -> None:
+        """Record a file this run uploaded (or saw change status)."""
+        with self._lock:
+            if f is None or not getattr(f, 'id', None):
+                self.reconciled_at = 0.0  # the SDK gave nothing to record: re-list next time
+                return
+            self.files[f.id] = self._record(f)
+
+    def remove(self, file_id: str) -> None:
+        with self._lock:
+            self.files.pop(file_id, None)
+
+    def mark_dirty(self) -> None:
+        self.save(clean=False)
+
+    def save(self, clean: bool = True) -> None:
+        self.clean = clean
+        if self.path is None:
+            return
+        with self._lock:
+            data = {
+                'version': self.VERSION,
+                'assistant': self.assistant,
+                'scope': self.scope,
+                'reconciled_at': self.reconciled_at,
+                'clean': clean,
+                'files': self.files,
+            }
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_name(self.path.name + '.tmp')
+                tmp.write_text(json.dumps(data), encoding='utf-8')
+                tmp.replace(self.path)
+            except OSError as e:
+                console.print(f"[dim]Could not save sync manifest {self.path}: {e}[/dim]")
+
+
+def manifest_scope(api_key: str, asst) -> str:
+    """Short digest of the API key (one per project) and the assistant's host.
+
+    Keys the default manifest path, so the same assistant name in two projects
+    or environments gets two manifests; the key itself is never written.
+    """
+    host = getattr(asst, 'host', None) or ''
+    return hashlib.blake2b(f"{api_key}\0{host}".encode(), digest_size=6).hexdigest()
+
+
+def file_changed(local_info: dict, remote_metadata: dict, local_digest=None) -> bool:
+    """Check if local file differs from remote.
+
+    Same size and mtime means unchanged, without reading the file. A size
+    change means changed. If only the mtime moved, the content digest decides
+    — `local_digest` is a callable, so the file is hashed only in that case.
+    Files uploaded without a 'content_hash' fall back to mtime and size.
+    """
     remote_mtime = remote_metadata.get('mtime')
     remote_size = remote_metadata.get('size')
+    remote_digest = remote_metadata.get('content_hash')
 
-    if remote_mtime is None or remote_size is None:
-        # No stored metadata, assume changed
+    if remote_size is None or local_info['size'] != int(remote_size):
         return True
+    if remote_mtime is not None and local_info['mtime'] == float(remote_mtime):
+        return False
+    if remote_digest and local_digest is not None:
+        return local_digest() != remote_digest
+    # No stored digest to compare, assume changed
+    return True
+
+
+def file_metadata(item: dict, hashes: HashCache) -> dict:
+    """Metadata stored with each synced file; read back by the next sync's change detection."""
+    return {
+        'file_path': item['rel_path'],
+        'mtime': item['local_info']['mtime'],
+        'size': item['local_info']['size'],
+        'content_hash': hashes.digest(item['local_path'], item['local_info']),
+        'uploaded_at': datetime.now(timezone.utc).isoformat(),
+        'source': 'sync_script',
+    }
+
+
+class UpdateMode(str, Enum):
+    """How a changed file replaces its remote copy."""
+    swap = "swap"        # upload, wait until Available, then delete the old copy
+    replace = "replace"  # delete the old copy, then upload (the path is briefly missing)
+
+
+def file_uploaded_at(f) -> str:
+    """Sort key for "newest copy": our own upload stamp, else the server's creation time."""
+    metadata = getattr(f, 'metadata', None) or {}
+    return str(metadata.get('uploaded_at') or getattr(f, 'created_on', None) or '')
+
+
+def pick_live_copy(copies: list):
+    """Choose which remote copy of a path to keep; return (keep, duplicates to delete).
 
-    return (local_info['mtime'] != float(remote_mtime) or
-            local_info['size'] != int(remote_size))
+    Normally there is one copy. More means an interrupted swap (or a retried
+    upload): keep the newest Available copy — else the newest of any status —
+    and delete the others, except copies newer than the kept one that are still
+    processing, which may belong to a sync in flight.
+    """
+    copies = sorted(copies, key=file_uploaded_at, reverse=True)
+    available = [f for f in copies if file_status(f) == 'available']
+    keep = available[0] if available else copies[0]
+    duplicates = [
+        f for f in copies
+        if f is not keep and not (file_status(f) == 'processing' and file_uploaded_at(f) > file_uploaded_at(keep))
+    ]
+    return keep, duplicates
+
+
+def delete_remote(asst, manifest: SyncManifest, file_id: str) -> None:
+    """Delete a remote file; one that is already gone (a retried delete) counts as deleted."""
+    try:
+        asst.delete_file(file_id=file_id)
+    except Exception as e:
+        if error_status(e) != 404:
+            raise
+    manifest.remove(file_id)
+
+
+def discard_failed(asst, manifest: SyncManifest, file_id: str) -> None:
+    """Best-effort delete of a copy that failed processing, so failures don't pile up remotely."""
+    try:
+        delete_remote(asst, manifest, file_id)
+    except Exception:
+        pass  # the next sync removes it as a duplicate
+
+
+def upload_new(asst, hashes: HashCache, manifest: SyncManifest, item: dict, retries: int) -> None:
+    """Upload a path and wait until it is Available; a copy that fails processing is deleted, not retried."""
+    new = upload_file(asst, str(item['local_path']), file_metadata(item, hashes), retries)
+    manifest.put(new)
+    try:
+        manifest.put(wait_until_available(asst, new.id, None, retries))
+    except ProcessingFailed:
+        discard_failed(asst, manifest, new.id)
+        raise
+
+
+def swap_file(asst, hashes: HashCache, manifest: SyncManifest, item: dict, retries: int,
+              processing_timeout: float) -> None:
+    """Upload the new version of a path and retire the old copy only once the new one is Available."""
+    new = upload_file(asst, str(item['local_path']), file_metadata(item, hashes), retries)
+    manifest.put(new)
+    try:
+        manifest.put(wait_until_available(asst, new.id, processing_timeout, retries))
+    except ProcessingFailed:
+        # The new version failed processing: drop it, leave the old copy live.
+        discard_failed(asst, manifest, new.id)
+        raise
+    except TimeoutError as e:
+        raise TimeoutError(f"{e}; the old copy was kept") from None
+    with_retries(lambda: delete_remote(asst, manifest, item['remote_file_id']), retries)
+
+
+def run_sync_job(asst, hashes: HashCache, manifest: SyncManifest, kind: str, item: dict, retries: int,
+                 update_mode: UpdateMode, processing_timeout: float) -> int:
+    """Apply one planned change and return how many duplicate copies it removed.
+
+    Each path appears in exactly one job, so work on a path is serialized: an
+    update's upload and delete run in order on one worker, and leftover
+    duplicates of the path are only deleted after that.
+    """
+    if kind == 'update' and update_mode == UpdateMode.swap:
+        swap_file(asst, hashes, manifest, item, retries, processing_timeout)
+    else:
+        if kind in ('update', 'delete'):
+            with_retries(lambda: delete_remote(asst, manifest, item['remote_file_id']), retries)
+        if kind in ('upload', 'update'):
+            upload_new(asst, hashes, manifest, item, retries)
+    duplicate_ids = item.get('duplicate_ids', [])
+    for file_id in duplicate_ids:
+        with_retries(lambda: delete_remote(asst, manifest, file_id), retries)
+    return len(duplicate_ids)
+
+
+def build_remote_map(remote_files: list):
+    """Map file_path -> the live remote copy, its metadata and any duplicate copies to delete."""
+    remote_copies = {}
+    for f in remote_files:
+        metadata = getattr(f, 'metadata', {}) or {}
+        remote_copies.setdefault(metadata.get('file_path', f.name), []).append(f)
+
+    remote_file_map = {}
+    for file_path, copies in remote_copies.items():
+        keep, duplicates = pick_live_copy(copies)
+        remote_file_map[file_path] = {
+            'file_obj': keep,
+            'metadata': getattr(keep, 'metadata', {}) or {},
+            'duplicate_ids': [f.id for f in duplicates],
+        }
+    return remote_file_map
+
+
+def load_remote_files(asst, manifest: SyncManifest, refresh: bool, max_age_s: float, quiet: bool = False) -> list:
+    """Current files in the assistant: from the manifest when it's fresh, else a listing (reporting drift)."""
+    if not refresh and manifest.fresh(max_age_s):
+        age_m = (time.time() - manifest.reconciled_at) / 60
+        if not quiet:
+            console.print(f"[dim]Using local manifest (reconciled {age_m:.0f}m ago; --refresh to re-list)[/dim]")
+        return manifest.remote_files()
+
+    with console.status("[bold blue]Fetching assistant files...[/bold blue]", spinner="dots"):
+        remote_files = asst.list_files()
+    drift = manifest.reconcile(remote_files)
+    manifest.save()
+    if any(drift.values()):
+        console.print(
+            f"[bold yellow]Drift since last sync:[/bold yellow] {len(drift['added'])} added, "
+            f"{len(drift['removed'])} removed, {len(drift['changed'])} changed by another writer"
+        )
+        for kind, sign in (('added', '+'), ('removed', '-'), ('changed', '~')):
+            for rel_path in sorted(drift[kind])[:10]:
+                console.print(f"  {sign} {rel_path}")
+        console.print()
+    return remote_files
+
+
+def plan_sync(source_path: Path, local_files: list, remote_file_map: dict, hashes: HashCache,
+              delete_missing: bool, scope: set | None = None) -> dict:
+    """Diff local files against the remote map.
+
+    `scope` limits the remote side to those relative paths — in watch mode, the
+    paths touched since the last batch — instead of the whole assistant.
+    """
+    plan = {
+        'to_upload': [],  # New files
+        'to_update': [],  # Changed files (delete + re-upload)
+        'to_delete': [],  # Files in assistant but not local
+        'unchanged': [],  # Files that match
+        'to_dedupe': [],  # Otherwise untouched paths with leftover duplicate copies
+    }
+
+    # Track which remote files we've seen
+    seen_remote_paths = set()
+
+    for local_file, local_stat in local_files:
+        # Get relative path from source root
+        if source_path.is_file():
+            rel_path = local_file.name
+        else:
+            rel_path = str(local_file.relative_to(source_path))
+
+        local_info = get_file_info(local_file, local_stat)
+
+        if rel_path in remote_file_map:
+            # File exists remotely, check if changed
+            seen_remote_paths.add(rel_path)
+            remote_info = remote_file_map[rel_path]
+
+            local_digest = lambda: hashes.digest(local_file, local_info)  # noqa: E731
+            if (file_status(remote_info['file_obj']) == 'processingfailed' or
+                    file_changed(local_info, remote_info['metadata'], local_digest)):
+                plan['to_update'].append({
+                    'local_path': local_file,
+                    'rel_path': rel_path,
+                    'remote_file_id': remote_info['file_obj'].id,
+                    'duplicate_ids': remote_info['duplicate_ids'],
+                    'local_info': local_info
+                })
+            else:
+                plan['unchanged'].append(rel_path)
+                if remote_info['duplicate_ids']:
+                    plan['to_dedupe'].append({'rel_path': rel_path, 'duplicate_ids': remote_info['duplicate_ids']})
+        else:
+            # New file
+            plan['to_upload'].append({
+                'local_path': local_file,
+                'rel_path': rel_path,
+                'local_info': local_info
+            })
+
+    # Find files to delete (in remote but not local)
+    for rel_path, remote_info in remote_file_map.items():
+        if rel_path in seen_remote_paths or (scope is not None and rel_path not in scope):
+            continue
+        if delete_missing:
+            plan['to_delete'].append({
+                'rel_path': rel_path,
+                'remote_file_id': remote_info['file_obj'].id,
+                'duplicate_ids': remote_info['duplicate_ids'],
+            })
+        elif remote_info['duplicate_ids']:
+            plan['to_dedupe'].append({'rel_path': rel_path, 'duplicate_ids': remote_info['duplicate_ids']})
+
+    plan['duplicate_count'] = sum(
+        len(item['duplicate_ids']) for key in ('to_update', 'to_delete', 'to_dedupe') for item in plan[key]
+    )
+    return plan
+
+
+def has_changes(plan: dict) -> bool:
+    return bool(plan['to_upload'] or plan['to_update'] or plan['to_delete'] or plan['to_dedupe'])
+
+
+def print_plan(plan: dict, delete_missing: bool) -> None:
+    """Summary table, plus the first 10 paths of each kind of change."""
+    console.print("[bold]Sync Summary:[/bold]\n")
+
+    summary_table = Table(show_header=True, header_style="bold cyan")
+    summary_table.add_column("Action", style="yellow", width=15)
+    summary_table.add_column("Count", style="green", width=10)
+
+    summary_table.add_row("New files", str(len(plan['to_upload'])))
+    summary_table.add_row("Updated files", str(len(plan['to_update'])))
+    if delete_missing:
+        summary_table.add_row("Deleted files", str(len(plan['to_delete'])))
+    summary_table.add_row("Unchanged", str(len(plan['unchanged'])))
+    if plan['duplicate_count']:
+        summary_table.add_row("Duplicates", str(plan['duplicate_count']))
+
+    console.print(summary_table)
+    console.print()
+
+    # Show details if there are changes
+    for key, title, sign in (('to_upload', "[bold green]Files to upload:[/bold green]", '+'),
+                             ('to_update', "[bold yellow]Files to update:[/bold yellow]", '~'),
+                             ('to_delete', "[bold red]Files to delete:[/bold red]", '-')):
+        items = plan[key]
+        if items:
+            console.print(title)
+            for item in items[:10]:  # Show first 10
+                console.print(f"  {sign} {item['rel_path']}")
+            if len(items) > 10:
+                console.print(f"  ... and {len(items) - 10} more")
+            console.print()
+
+    if plan['duplicate_count']:
+        console.print(f"[bold yellow]{plan['duplicate_count']} duplicate copy(ies) from an interrupted sync will be removed[/bold yellow]\n")
+
+
+def execute_sync(asst, hashes: HashCache, manifest: SyncManifest, plan: dict, *, concurrency: int,
+                 retries: int, update_mode: UpdateMode, processing_timeout: float):
+    """Run a plan on the worker pool. Returns (counts by action, failures, seconds taken)."""
+    jobs = ([('upload', item) for item in plan['to_upload']] +
+            [('update', item) for item in plan['to_update']] +
+            [('delete', item) for item in plan['to_delete']] +
+            [('dedupe', item) for item in plan['to_dedupe']])
+    counts = {'upload': 0, 'update': 0, 'delete': 0, 'dedupe': 0}
+    failures = []  # (rel_path, action, error)
+
+    manifest.mark_dirty()
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TextColumn("{task.fields[rate]}"),
+        TimeElapsedColumn(),
+        console=console
+    ) as progress:
+        task = progress.add_task(f"Syncing {len(jobs)} file(s)...", total=len(jobs), rate="")
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = {
+                pool.submit(run_sync_job, asst, hashes, manifest, kind, item, retries,
+                            update_mode, processing_timeout): (kind, item)
+                for kind, item in jobs
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                kind, item = futures[future]
+                try:
+                    counts['dedupe'] += future.result()
+                    if kind != 'dedupe':
+                        counts[kind] += 1
+                except Exception as e:
+                    failures.append((item['rel_path'], kind, e))
+                    progress.console.print(f"[red]Failed to {kind} {item['rel_path']}: {e}[/red]")
+                elapsed = max(time.monotonic() - started, 1e-6)
+                progress.update(task, advance=1, rate=f"{done / elapsed:.1f} files/s")
+
+    manifest.save(clean=not failures)  # after failures, re-list next run
+    return counts, failures, time.monotonic() - started
+
+
+def print_failures(failures: list) -> None:
+    fail_table = Table(show_header=True, header_style="bold red")
+    fail_table.add_column("File", style="yellow")
+    fail_table.add_column("Action", width=8)
+    fail_table.add_column("Error", style="red")
+    for rel_path, action, e in sorted(failures, key=lambda f: f[0]):
+        fail_table.add_row(rel_path, action, str(e))
+    console.print(fail_table)
+
+
+class ChangeCollector:
+    """Relative paths touched since the last batch, fed by watchdog events or by polling."""
+
+    def __init__(self, source_path: Path):
+        self.source_path = source_path
+        self.paths = set()
+        self.last_event = 0.0
+        self.first_event = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, path: str) -> None:
+        try:
+            rel_path = str(Path(path).relative_to(self.source_path))
+        except ValueError:
+            return
+        if rel_path == '.' or is_excluded(rel_path):
+            return
+        with self._lock:
+            now = time.monotonic()
+            if not self.paths:
+                self.first_event = now
+            self.paths.add(rel_path)
+            self.last_event = now
+
+    def take_batch(self, debounce_s: float) -> set:
+        """The pending paths once events have settled for `debounce_s` (or WATCH_MAX_WAIT_S passed); else empty."""
+        with self._lock:
+            now = time.monotonic()
+            if not self.paths or (now - self.last_event < debounce_s and now - self.first_event < WATCH_MAX_WAIT_S):
+                return set()
+            batch, self.paths = self.paths, set()
+            return batch
+
+
+if Observer is not None:
+    class WatchHandler(FileSystemEventHandler):
+        def __init__(self, collector: ChangeCollector):
+            self.collector = collector
+
+        def on_any_event(self, event):
+            # A directory's own "modified" event just means an entry inside changed,
+            # which arrives as its own event; rescanning the directory would be wasted.
+            if event.event_type in ('opened', 'closed_no_write') or (event.is_directory and event.event_type == 'modified'):
+                return
+            self.collector.add(event.src_path)
+            if getattr(event, 'dest_path', None):
+                self.collector.add(event.dest_path)
+
+
+def poll_snapshot(source_path: Path) -> dict:
+    """(inode, mtime, size) of every supported file, for the polling fallback.
+
+    One stat per file and a listing per directory, every poll: an edit in place
+    changes only the file, not its directory, so no subtree can be skipped.
+    """
+    return {
+        str(path): (st.st_ino, st.st_mtime_ns, st.st_size)
+        for path, st in scan_files(source_path)
+    }
+
+
+def files_in_scope(source_path: Path, scope: set, remote_file_map: dict) -> tuple[list, set]:
+    """Expand a batch of touched paths into local files to plan, and the remote paths they cover.
+
+    A touched directory stands for everything under it: files found there now,
+    and remote paths below it (which are deletions if it is gone).
+    """
+    local_files = {}
+    covered = set()
+    for rel_path in scope:
+        path = source_path / rel_path
+        covered.add(rel_path)
+        prefix = rel_path + os.sep
+        covered.update(p for p in remote_file_map if p.startswith(prefix))
+        try:
+            if path.is_dir():
+                for file_path, st in scan_files(path):
+                    local_files[file_path] = st
+                    covered.add(str(file_path.relative_to(source_path)))
+            elif path.suffix.lower() in SUPPORTED_EXTENSIONS and path.is_file():
+                local_files[path] = path.stat()
+        except OSError:
+            continue  # removed again before we got to it
+    return sorted(local_files.items(), key=lambda f: f[0]), covered
+
+
+def watch_loop(asst, hashes: HashCache, manifest: SyncManifest, source_path: Path, *, delete_missing: bool,
+               dry_run: bool, debounce: float, poll_interval: float, reconcile_s: float, sync_options: dict) -> None:
+    """Sync batches of changed paths until interrupted."""
+    collector = ChangeCollector(source_path)
+    observer = None
+    if Observer is not None:
+        observer = Observer()
+        observer.schedule(WatchHandler(collector), str(source_path), recursive=True)
+        observer.start()
+        console.print(f"[bold cyan]Watching {source_path} for changes (Ctrl-C to stop)...[/bold cyan]")
+    else:
+        started = time.monotonic()
+        snapshot = poll_snapshot(source_path)
+        interval = max(poll_interval, (time.monotonic() - started) * POLL_MAX_BUSY)
+        console.print(f"[bold cyan]Watching {source_path} by polling every {interval:.3g}s "
+                      f"(install watchdog for event-driven watching; Ctrl-C to stop)...[/bold cyan]")
+
+    try:
+        while True:
+            time.sleep(min(debounce, poll_interval) / 2 if observer else interval)
+            if observer is None:
+                started = time.monotonic()
+                current = poll_snapshot(source_path)
+                interval = max(poll_interval, (time.monotonic() - started) * POLL_MAX_BUSY)
+                for path in current.keys() ^ snapshot.keys():
+                    collector.add(path)
+                for path in current.keys() & snapshot.keys():
+                    if current[path] != snapshot[path]:
+                        collector.add(path)
+                snapshot = current
+
+            batch = collector.take_batch(debounce)
+            if not batch:
+                continue
+
+            remote_files = load_remote_files(asst, manifest, refresh=False, max_age_s=reconcile_s, quiet=True)
+            remote_file_map = build_remote_map(remote_files)
+            local_files, scope = files_in_scope(source_path, batch, remote_file_map)
+            plan = plan_sync(source_path, local_files, remote_file_map, hashes, delete_missing, scope)
+            if not has_changes(plan):
+                continue
+
+            stamp = datetime.now().strftime('%H:%M:%S')
+            changes = [f"+{len(plan['to_upload'])}", f"~{len(plan['to_update'])}"]
+            if delete_missing:
+                changes.append(f"-{len(plan['to_delete'])}")
+            if dry_run:
+                console.print(f"[dim]{stamp}[/dim] would sync {' '.join(changes)}: "
+                              f"{', '.join(sorted(item['rel_path'] for key in ('to_upload', 'to_update', 'to_delete') for item in plan[key])[:10])}")
+                continue
+
+            counts, failures, seconds = execute_sync(asst, hashes, manifest, plan, **sync_options)
+            hashes.save(source_path)
+            console.print(f"[dim]{stamp}[/dim] synced {' '.join(changes)} in {seconds:.1f}s"
+                          + (f" [red]({len(failures)} failed)[/red]" if failures else ""))
+            if failures:
+                print_failures(failures)
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Stopped watching[/yellow]")
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
 
 
 @app.command()
@@ -100,6 +862,19 @@ def main(
     delete_missing: bool = typer.Option(False, "--delete-missing", help="Delete files from assistant that don't exist locally"),
     dry_run: bool = typer.Option(False, "--dry-run", help="Show what would change without making changes"),
     yes: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation prompt"),
+    hash_cache: Path = typer.Option(DEFAULT_HASH_CACHE, "--hash-cache", help="Local cache of file content digests"),
+    no_hash_cache: bool = typer.Option(False, "--no-hash-cache", help="Re-hash files instead of using the digest cache"),
+    concurrency: int = typer.Option(4, "--concurrency", "-c", min=1, help="Files uploaded/deleted in parallel"),
+    retries: int = typer.Option(3, "--retries", min=0, help="Retries per file for throttled / 5xx / network errors"),
+    update_mode: UpdateMode = typer.Option(UpdateMode.swap, "--update-mode", help="swap: upload, wait until Available, then delete the old copy; replace: delete first"),
+    processing_timeout: float = typer.Option(600, "--processing-timeout", help="Seconds a swapped-in file may take to become Available"),
+    manifest_path: Path = typer.Option(None, "--manifest", help="Local manifest of remote files (default: ~/.cache/pinecone-assistant/<assistant>.<project digest>.manifest.json)"),
+    no_manifest: bool = typer.Option(False, "--no-manifest", help="Always list remote files; don't read or write a manifest"),
+    refresh: bool = typer.Option(False, "--refresh", help="Re-list remote files now and report drift from the manifest"),
+    reconcile_hours: float = typer.Option(0.25, "--reconcile-hours", help="Re-list remote files when the manifest is older than this (default: 15 minutes)"),
+    watch: bool = typer.Option(False, "--watch", help="After syncing, keep watching the source and sync changes as they happen"),
+    debounce: float = typer.Option(1.0, "--debounce", help="Watch mode: seconds of quiet before a batch of changes is synced"),
+    poll_interval: float = typer.Option(2.0, "--poll-interval", help="Watch mode without watchdog: seconds between scans (stretched for large trees)"),
 ):
     """Sync local files to Pinecone Assistant, only uploading new or changed files."""
 
@@ -115,6 +890,9 @@ def main(
     if not source_path.exists():
         console.print(f"[red]Error: Source path does not exist: {source}[/red]")
         raise typer.Exit(1)
+    if watch and not source_path.is_dir():
+        console.print("[red]Error: --watch needs a directory as --source[/red]")
+        raise typer.Exit(1)
 
     try:
         # Initialize Pinecone client
@@ -128,27 +906,20 @@ def main(
             border_style="cyan"
         ))
 
-        # Step 1: Get current files in assistant
-        with console.status("[bold blue]Fetching assistant files...[/bold blue]", spinner="dots"):
-            remote_files = asst.list_files()
-
-        # Build map of file_path -> file object
-        remote_file_map = {}
-        for f in remote_files:
-            metadata = getattr(f, 'metadata', {}) or {}
-            file_path = metadata.get('file_path', f.name)
-            remote_file_map[file_path] = {
-                'file_obj': f,
-                'metadata': metadata
-            }
+        # Step 1: Get current files in assistant, from the manifest when it's fresh
+        scope = manifest_scope(api_key, asst)
+        manifest = SyncManifest(None if no_manifest else (manifest_path or CACHE_DIR / f"{assistant}.{scope}.manifest.json"),
+                                assistant, scope)
+        remote_files = load_remote_files(asst, manifest, refresh, reconcile_hours * 3600)
+        remote_file_map = build_remote_map(remote_files)
 
         console.print(f"[dim]Found {len(remote_files)} file(s) in assistant[/dim]\n")
 
         # Step 2: Find local files
         with console.status("[bold blue]Scanning local files...[/bold blue]", spinner="dots"):
-            local_files = find_files(source_path)
+            local_files = scan_files(source_path)
 
-        if not local_files:
+        if not local_files and not watch:
             console.print("[yellow]No supported files found in source path[/yellow]")
             console.print(f"Supported extensions: {', '.join(sorted(SUPPORTED_EXTENSIONS))}")
             raise typer.Exit(0)
@@ -156,103 +927,34 @@ def main(
         console.print(f"[dim]Found {len(local_files)} local file(s)[/dim]\n")
 
         # Step 3: Determine what needs syncing
-        to_upload = []  # New files
-        to_update = []  # Changed files (delete + re-upload)
-        to_delete = []  # Files in assistant but not local
-        unchanged = []  # Files that match
-
-        # Track which remote files we've seen
-        seen_remote_paths = set()
-
-        for local_file in local_files:
-            # Get relative path from source root
-            if source_path.is_file():
-                rel_path = local_file.name
-            else:
-                rel_path = str(local_file.relative_to(source_path))
-
-            local_info = get_file_info(local_file)
-
-            if rel_path in remote_file_map:
-                # File exists remotely, check if changed
-                seen_remote_paths.add(rel_path)
-                remote_info = remote_file_map[rel_path]
-
-                if file_changed(local_info, remote_info['metadata']):
-                    to_update.append({
-                        'local_path': local_file,
-                        'rel_path': rel_path,
-                        'remote_file_id': remote_info['file_obj'].id,
-                        'local_info': local_info
-                    })
-                else:
-                    unchanged.append(rel_path)
-            else:
-                # New file
-                to_upload.append({
-                    'local_path': local_file,
-                    'rel_path': rel_path,
-                    'local_info': local_info
-                })
+        hashes = HashCache(None if no_hash_cache else hash_cache)
+        plan = plan_sync(source_path, local_files, remote_file_map, hashes, delete_missing)
 
-        # Find files to delete (in remote but not local)
-        if delete_missing:
-            for rel_path, remote_info in remote_file_map.items():
-                if rel_path not in seen_remote_paths:
-                    to_delete.append({
-                        'rel_path': rel_path,
-                        'remote_file_id': remote_info['file_obj'].id
-                    })
+        hashes.save(source_path)
+        if hashes.hashed:
+            console.print(f"[dim]Hashed {hashes.hashed} file(s) for change detection[/dim]\n")
 
         # Step 4: Show summary
-        console.print("[bold]Sync Summary:[/bold]\n")
+        print_plan(plan, delete_missing)
 
-        summary_table = Table(show_header=True, header_style="bold cyan")
-        summary_table.add_column("Action", style="yellow", width=15)
-        summary_table.add_column("Count", style="green", width=10)
-
-        summary_table.add_row("New files", str(len(to_upload)))
-        summary_table.add_row("Updated files", str(len(to_update)))
-        if delete_missing:
-            summary_table.add_row("Deleted files", str(len(to_delete)))
-        summary_table.add_row("Unchanged", str(len(unchanged)))
-
-        console.print(summary_table)
-        console.print()
-
-        # Show details if there are changes
-        if to_upload:
-            console.print("[bold green]Files to upload:[/bold green]")
-            for item in to_upload[:10]:  # Show first 10
-                console.print(f"  + {item['rel_path']}")
-            if len(to_upload) > 10:
-                console.print(f"  ... and {len(to_upload) - 10} more")
-            console.print()
-
-        if to_update:
-            console.print("[bold yellow]Files to update:[/bold yellow]")
-            for item in to_update[:10]:
-                console.print(f"  ~ {item['rel_path']}")
-            if len(to_update) > 10:
-                console.print(f"  ... and {len(to_update) - 10} more")
-            console.print()
-
-        if to_delete:
-            console.print("[bold red]Files to delete:[/bold red]")
-            for item in to_delete[:10]:
-                console.print(f"  - {item['rel_path']}")
-            if len(to_delete) > 10:
-                console.print(f"  ... and {len(to_delete) - 10} more")
-            console.print()
+        sync_options = dict(concurrency=concurrency, retries=retries, update_mode=update_mode,
+                            processing_timeout=processing_timeout)
+        watch_options = dict(delete_missing=delete_missing, dry_run=dry_run, debounce=debounce,
+                             poll_interval=poll_interval, reconcile_s=reconcile_hours * 3600,
+                             sync_options=sync_options)
 
         # If no changes, exit early
-        if not (to_upload or to_update or to_delete):
+        if not has_changes(plan):
             console.print("[green]✓ All files are up to date![/green]")
+            if watch:
+                watch_loop(asst, hashes, manifest, source_path, **watch_options)
             return
 
         # Dry run mode
         if dry_run:
             console.print("[yellow]Dry run mode: No changes made[/yellow]")
+            if watch:
+                watch_loop(asst, hashes, manifest, source_path, **watch_options)
             return
 
         # Confirmation prompt
@@ -265,86 +967,35 @@ def main(
         console.print()
 
         # Step 5: Execute sync
-        uploaded_count = 0
-        updated_count = 0
-        deleted_count = 0
-
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
-
-            # Upload new files
-            if to_upload:
-                task = progress.add_task(f"Uploading {len(to_upload)} new file(s)...", total=len(to_upload))
-                for item in to_upload:
-                    try:
-                        asst.upload_file(
-                            file_path=str(item['local_path']),
-                            metadata={
-                                'file_path': item['rel_path'],
-                                'mtime': item['local_info']['mtime'],
-                                'size': item['local_info']['size'],
-                                'uploaded_at': datetime.now(timezone.utc).isoformat(),
-                                'source': 'sync_script',
-                            },
-                            timeout=None
-                        )
-                        uploaded_count += 1
-                        progress.advance(task)
-                    except Exception as e:
-                        console.print(f"[red]Failed to upload {item['rel_path']}: {e}[/red]")
-
-            # Update changed files (delete old + upload new)
-            if to_update:
-                task = progress.add_task(f"Updating {len(to_update)} file(s)...", total=len(to_update) * 2)
-                for item in to_update:
-                    try:
-                        # Delete old version
-                        asst.delete_file(file_id=item['remote_file_id'])
-                        progress.advance(task)
-
-                        # Upload new version
-                        asst.upload_file(
-                            file_path=str(item['local_path']),
-                            metadata={
-                                'file_path': item['rel_path'],
-                                'mtime': item['local_info']['mtime'],
-                                'size': item['local_info']['size'],
-                                'uploaded_at': datetime.now(timezone.utc).isoformat(),
-                                'source': 'sync_script',
-                            },
-                            timeout=None
-                        )
-                        updated_count += 1
-                        progress.advance(task)
-                    except Exception as e:
-                        console.print(f"[red]Failed to update {item['rel_path']}: {e}[/red]")
-
-            # Delete missing files
-            if to_delete:
-                task = progress.add_task(f"Deleting {len(to_delete)} file(s)...", total=len(to_delete))
-                for item in to_delete:
-                    try:
-                        asst.delete_file(file_id=item['remote_file_id'])
-                        deleted_count += 1
-                        progress.advance(task)
-                    except Exception as e:
-                        console.print(f"[red]Failed to delete {item['rel_path']}: {e}[/red]")
+        counts, failures, seconds = execute_sync(asst, hashes, manifest, plan, **sync_options)
+        hashes.save(source_path)
 
         # Final summary
+        jobs = sum(len(plan[key]) for key in ('to_upload', 'to_update', 'to_delete', 'to_dedupe'))
         console.print()
         console.print(Panel(
-            f"[green]✓ Sync complete![/green]\n\n"
-            f"Uploaded: {uploaded_count}\n"
-            f"Updated: {updated_count}\n"
-            + (f"Deleted: {deleted_count}\n" if delete_missing else "") +
-            f"Unchanged: {len(unchanged)}",
+            (f"[green]✓ Sync complete![/green]\n\n" if not failures else
+             f"[yellow]Sync finished with {len(failures)} failure(s)[/yellow]\n\n") +
+            f"Uploaded: {counts['upload']}\n"
+            f"Updated: {counts['update']}\n"
+            + (f"Deleted: {counts['delete']}\n" if delete_missing else "") +
+            f"Unchanged: {len(plan['unchanged'])}\n"
+            + (f"Duplicates removed: {counts['dedupe']}\n" if plan['duplicate_count'] else "") +
+            f"Throughput: {jobs / max(seconds, 1e-6):.1f} files/s",
             title="Results",
-            border_style="green"
+            border_style="green" if not failures else "yellow"
         ))
 
+        if failures:
+            print_failures(failures)
+            if not watch:
+                raise typer.Exit(1)
+
+        if watch:
+            watch_loop(asst, hashes, manifest, source_path, **watch_options)
+
+    except typer.Exit:
+        raise
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
         raise typer.Exit(1)
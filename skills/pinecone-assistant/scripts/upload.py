@@ -14,19 +14,49 @@ Supported: DOCX (.docx), JSON (.json), Markdown (.md), PDF (.pdf), Text (.txt)
 Code files are NOT supported by Pinecone Assistant.
 
 Usage:
-    uv run upload.py --assistant NAME --source PATH [--patterns "*.md,*.pdf,*.docx"]
+    uv run upload.py --assistant NAME --source PATH [--patterns "*.md,*.pdf,*.docx"] [--skip-existing]
+                     [--concurrency N] [--wait] [--resume]
 
 Environment Variables:
     PINECONE_API_KEY: Required Pinecone API key
 
 Output:
     Progress updates and summary of uploaded files
+
+Every file is uploaded with a content digest in its metadata ('content_hash',
+the same digest sync.py records). With --skip-existing the assistant's file
+list is fetched once and files whose content it already holds are skipped,
+as are repeats of identical content at several local paths, so re-running
+after a partial failure only uploads what is missing. A repeat is settled by
+the upload it duplicates: skipped if that succeeds, uploaded in its place if
+the request fails, failed with it if it fails processing.
+
+Only request errors (429, 5xx, network) are retried. A file that fails
+server-side processing is deleted from the assistant and reported as failed;
+uploading it again would fail the same way.
+
+With --wait the script doesn't return until every uploaded file is Available:
+processing status is polled for all of them together (one list_files call per
+poll), time-to-available percentiles are reported, and the exit code is 1 if
+any file failed processing or didn't finish within --wait-timeout.
+
+Progress is journaled to ~/.cache/pinecone-assistant/<assistant>.upload-journal.jsonl,
+one JSON line (path, digest, file_id, status) as each upload is submitted and
+as it completes. After an interruption, --resume replays the journal and skips
+files already uploaded with the same content, so only pending and failed files
+are sent again.
 """
 
 import os
-import glob
+import re
+import json
+import math
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Iterator, List
 from datetime import datetime, timezone
 import typer
 from rich.console import Console
@@ -34,6 +64,7 @@ from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskPr
 from rich.table import Table
 from rich.panel import Panel
 from pinecone import Pinecone
+from assistant_io import ProcessingFailed, file_status, hash_file, upload_file, wait_until_available, with_retries
 
 app = typer.Typer()
 console = Console()
@@ -45,33 +76,401 @@ DEFAULT_PATTERNS = ["**/*.md", "**/*.txt", "**/*.pdf", "**/*.docx", "**/*.json"]
 # Default directories to exclude
 DEFAULT_EXCLUDES = ["node_modules", ".venv", "venv", ".git", "build", "dist", "__pycache__", ".next", ".cache"]
 
+# --wait polling: fast at first, since small text files are often ready within
+# seconds, backing off for large PDF batches.
+POLL_FIRST_S = 1.0
+POLL_MAX_S = 15.0
+
+# Upload journals (<assistant>.upload-journal.jsonl), shared with sync.py's
+# hash cache and manifests.
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "pinecone-assistant"
+
+
+def glob_to_regex(pattern: str) -> str:
+    """Translate a glob, as glob.glob(recursive=True) reads it relative to the source, to a regex over '/'-joined relative paths."""
+    pattern = pattern.replace(os.sep, "/").removeprefix("./")
+    out, i = [], 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:[^/]+/)*")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1:end]
+            out.append("[" + ("^" + body[1:] if body.startswith("!") else body).replace("\\", "\\\\") + "]")
+            i = end + 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)
+
+
+def compile_patterns(patterns: List[str]) -> re.Pattern:
+    """All include patterns as one regex, so each path is tested once rather than once per pattern."""
+    return re.compile("|".join(f"(?:{glob_to_regex(p)})" for p in patterns if p))
+
+
+def iter_files(source_path: str, patterns: List[str], excludes: List[str]) -> Iterator[Path]:
+    """Yield files matching patterns in one walk of the tree, as they are found.
+
+    An exclude is a directory name (`build` skips every directory named
+    exactly `build`, not `rebuild-notes.md`) or, if it contains a `/`, a path
+    relative to the source. Excluded and dot directories are pruned before
+    being entered; dot files are skipped, as glob skips them.
+    """
+    source = Path(source_path)
+    if source.is_file():
+        yield source
+        return
+
+    matches = compile_patterns(patterns).fullmatch
+    exclude_names = {e for e in excludes if e and "/" not in e}
+    exclude_paths = {e.strip("/") for e in excludes if "/" in e}
+
+    stack = [("", str(source))]
+    while stack:
+        rel_dir, dir_path = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue  # unreadable, or removed mid-walk
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            if name.startswith("."):
+                continue
+            rel_path = rel_dir + name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if name not in exclude_names and rel_path not in exclude_paths:
+                        subdirs.append((rel_path + "/", entry.path))
+                elif matches(rel_path) and entry.is_file():
+                    yield Path(entry.path)
+            except OSError:
+                continue
+        stack.extend(reversed(subdirs))
+
 
 def find_files(source_path: str, patterns: List[str], excludes: List[str]) -> List[Path]:
     """Find files matching patterns, excluding certain directories."""
-    source = Path(source_path)
-
-    if not source.exists():
+    if not Path(source_path).exists():
         console.print(f"[red]Error: Path '{source_path}' does not exist[/red]")
         raise typer.Exit(1)
+    return sorted(set(iter_files(source_path, patterns, excludes)))
+
+
+def remote_digests(asst) -> dict:
+    """content_hash -> file_path for the assistant's files (one listing).
+
+    Files that failed processing don't count: their content isn't searchable.
+    """
+    digests = {}
+    for f in asst.list_files():
+        metadata = getattr(f, "metadata", None) or {}
+        digest = metadata.get("content_hash")
+        if digest and (getattr(f, "status", None) or "").lower() != "processingfailed":
+            digests[digest] = metadata.get("file_path", f.name)
+    return digests
 
-    # If it's a single file, return it
-    if source.is_file():
-        return [source]
 
-    # Otherwise, scan directory
-    files = []
-    for pattern in patterns:
-        matched = glob.glob(str(source / pattern), recursive=True)
-        files.extend([Path(f) for f in matched])
+class DigestRegistry:
+    """Content already uploaded (or being uploaded) this run, shared by the upload workers.
 
-    # Filter out excluded directories
-    filtered_files = []
-    for file_path in files:
-        # Check if any exclude pattern is in the path
-        if not any(excl in str(file_path) for excl in excludes):
-            filtered_files.append(file_path)
+    A duplicate of a copy that is still uploading is parked on that claim
+    rather than reported as skipped: if the upload fails, the duplicate still
+    has to be uploaded (or failed) in its place.
+    """
+
+    def __init__(self, digests: dict):
+        self.digests = digests  # content_hash -> file_path
+        self.claims = {}  # file_path -> content_hash, for uploads in flight
+        self.parked = {}  # content_hash -> duplicate file_paths waiting on that upload
+        self.unprocessable = {}  # content_hash -> file_path whose copy failed processing
+        self._lock = threading.Lock()
+
+    def claim(self, digest: str, rel_path: str):
+        """Register rel_path as the copy of this content, or find the path already holding it.
+
+        Returns (state, holder): "claimed" when rel_path won the claim;
+        "duplicate" when holder already has the content; "parked" when holder
+        is still uploading it, so `settle` will hand rel_path back; and
+        "unprocessable" when holder's copy failed processing.
+        """
+        with self._lock:
+            if digest in self.unprocessable:
+                return "unprocessable", self.unprocessable[digest]
+            holder = self.digests.get(digest)
+            if holder is None:
+                self.digests[digest] = rel_path
+                self.claims[rel_path] = digest
+                self.parked[digest] = []
+                return "claimed", None
+            if digest in self.parked:
+                self.parked[digest].append(rel_path)
+                return "parked", holder
+            return "duplicate", holder
+
+    def settle(self, rel_path: str, uploaded: bool, processing_failed: bool = False) -> list:
+        """End rel_path's claim — kept if it uploaded, given up if not — and return the paths parked on it."""
+        with self._lock:
+            digest = self.claims.pop(rel_path, None)
+            if digest is None:
+                return []
+            if not uploaded:
+                del self.digests[digest]
+                if processing_failed:
+                    self.unprocessable[digest] = rel_path
+            return self.parked.pop(digest)
+
+
+class UploadJournal:
+    """Append-only JSONL record of an upload run: one line per status change of a file.
+
+    The first line names the assistant and source; each later line is
+    {"path", "status", ...} with status pending (submitted), uploaded, skipped,
+    failed, and with --wait available or processing_failed. Replaying it, the
+    last line for a path wins. Lines are flushed as written, so an interrupted
+    run leaves everything up to the interruption. Written from upload worker
+    callbacks, hence the lock. With path=None nothing is recorded.
+    """
+
+    VERSION = 1
+    DONE = {"uploaded", "skipped", "available"}
+
+    def __init__(self, path: Path | None, assistant: str, source: str, resume: bool):
+        self.path = path
+        self.entries = {}  # rel_path -> last known {"digest", "file_id", "status", ...}
+        self._file = None
+        self._lock = threading.Lock()
+        if path is None:
+            return
+        header = {"journal": self.VERSION, "assistant": assistant, "source": str(Path(source).resolve())}
+        if resume and path.exists():
+            with path.open(encoding="utf-8") as f:
+                lines = f.read().splitlines()
+            first = json.loads(lines[0]) if lines else {}
+            if {k: first.get(k) for k in header} != header:
+                raise ValueError(f"Journal {path} is for a different assistant or source; "
+                                 f"it records {first.get('assistant')!r} from {first.get('source')!r}")
+            for line in lines[1:]:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # torn last line from a killed run
+                self.entries.setdefault(record.pop("path"), {}).update(record)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = path.open("a" if resume and self.entries else "w", encoding="utf-8")
+        if not self.entries:
+            self._write({**header, "started_at": datetime.now(timezone.utc).isoformat()})
+
+    def completed(self) -> dict:
+        """rel_path -> digest of files a previous run finished with."""
+        return {p: e.get("digest") for p, e in self.entries.items() if e.get("status") in self.DONE}
 
-    return sorted(set(filtered_files))
+    def unfinished(self) -> int:
+        return sum(1 for e in self.entries.values() if e.get("status") not in self.DONE)
+
+    def record(self, rel_path: str, status: str, **fields) -> None:
+        with self._lock:
+            self.entries.setdefault(rel_path, {}).update(status=status, **fields)
+            self._write({"path": rel_path, "status": status, **fields})
+
+    def _write(self, record: dict) -> None:
+        if self._file is not None and not self._file.closed:
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+class ByteBudget:
+    """Caps the total size of files being uploaded at once, so a run of large PDFs can't exhaust memory.
+
+    A file larger than the whole budget still goes, on its own.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, size: int) -> None:
+        with self._cond:
+            self._cond.wait_for(lambda: self.in_flight == 0 or self.in_flight + size <= self.limit)
+            self.in_flight += size
+
+    def release(self, size: int) -> None:
+        with self._cond:
+            self.in_flight -= size
+            self._cond.notify_all()
+
+
+def upload_one(asst, file_path: Path, rel_path: str, extra_metadata: dict, registry, retries: int,
+               wait_for_processing: bool = True, completed: dict | None = None):
+    """Hash and upload one file. Returns (outcome, detail, digest): ("uploaded", file model, ...),
+    ("resumed", reason, ...), or a DigestRegistry.claim state with the path
+    holding the same content: ("duplicate" / "parked" / "unprocessable", holder, ...).
+    A parked file's outcome is settled once its holder's upload ends.
+
+    With wait_for_processing=False the upload returns as soon as the file is
+    accepted, and processing is followed by a ProcessingTracker instead.
+    Otherwise a copy that fails processing is deleted and ProcessingFailed
+    raised; it is never uploaded again, since it would fail the same way.
+    `completed` maps paths a resumed journal finished to their digest.
+    """
+    # Content digest, recorded with the upload and used by --skip-existing and --resume
+    digest = hash_file(file_path)
+    if completed and completed.get(rel_path) == digest:
+        return "resumed", "uploaded by the journaled run", digest
+    if registry is not None:
+        state, holder = registry.claim(digest, rel_path)
+        if state != "claimed":
+            return state, holder, digest
+
+    # Build metadata
+    stat = file_path.stat()
+    metadata = {
+        "source": "upload_script",
+        "file_path": rel_path,
+        "file_type": file_path.suffix,
+        "content_type": "documentation",
+        "mtime": stat.st_mtime,
+        "size": stat.st_size,
+        "content_hash": digest,
+        "uploaded_at": datetime.now(timezone.utc).isoformat(),
+        **extra_metadata,
+    }
+
+    # Upload file; only the request is retried, never a failed processing
+    response = upload_file(asst, str(file_path), metadata, retries)
+    if wait_for_processing:
+        try:
+            response = wait_until_available(asst, response.id, None, retries)
+        except ProcessingFailed:
+            discard_failed(asst, response.id)
+            raise
+    return "uploaded", response, digest
+
+
+def discard_failed(asst, file_id: str) -> None:
+    """Best-effort delete of a copy that failed processing, so re-runs don't pile up failed copies."""
+    try:
+        asst.delete_file(file_id=file_id)
+    except Exception:
+        pass
+
+
+def percentile(values: list, q: float) -> float:
+    """Nearest-rank percentile of `values`, q in 0..1 (0.0 when empty); same convention as ingest.py's."""
+    if not values:
+        return 0.0
+    ranked = sorted(values)
+    return ranked[min(len(ranked) - 1, max(0, math.ceil(q * len(ranked) - 1e-9) - 1))]
+
+
+class ProcessingTracker:
+    """Follows uploaded files until they are Available, with one list_files call per poll for all of them.
+
+    `add` is called from upload workers as each upload is accepted, so polling
+    overlaps the uploads and time-to-available is measured from each file's
+    own acceptance. Copies that fail processing are deleted and reported,
+    along with the duplicates skipped in their favour.
+    """
+
+    def __init__(self, asst, journal: UploadJournal):
+        self.asst = asst
+        self.journal = journal
+        self.pending = {}   # file_id -> (rel_path, accepted at)
+        self.ready = {}     # rel_path -> seconds from accepted to Available (None: accepted by an earlier run)
+        self.failed = []    # (rel_path, error message)
+        self.duplicates = {}  # rel_path -> paths skipped as its duplicates, which fail with it
+        self.uploads_done = threading.Event()
+        self._lock = threading.Lock()
+
+    def add(self, file_id: str, rel_path: str, timed: bool = True) -> None:
+        """Track a file; timed=False for one accepted by an earlier run, which is left out of the latency stats."""
+        with self._lock:
+            self.pending[file_id] = (rel_path, time.monotonic() if timed else None)
+
+    def add_duplicate(self, rel_path: str, holder: str) -> None:
+        """Report rel_path as failed too if `holder`, whose content it shares, fails processing."""
+        with self._lock:
+            if any(path == holder for path, _ in self.failed):
+                self._fail_duplicate(rel_path, holder)
+            else:
+                self.duplicates.setdefault(holder, []).append(rel_path)
+
+    def _fail_duplicate(self, rel_path: str, holder: str) -> None:
+        error = f"same content as {holder}, which failed processing"
+        self.failed.append((rel_path, error))
+        self.journal.record(rel_path, "processing_failed", error=error)
+
+    def tracked(self) -> int:
+        return len(self.pending) + len(self.ready) + len(self.failed)
+
+    def poll(self) -> None:
+        files = with_retries(self.asst.list_files, 3)
+        now = time.monotonic()
+        failed_ids = []
+        with self._lock:
+            for f in files:
+                if f.id not in self.pending:
+                    continue
+                status = file_status(f)
+                if status == "available":
+                    rel_path, accepted = self.pending.pop(f.id)
+                    self.ready[rel_path] = None if accepted is None else now - accepted
+                    self.journal.record(rel_path, "available")
+                elif status == "processingfailed":
+                    rel_path, _ = self.pending.pop(f.id)
+                    error = getattr(f, "error_message", None) or "processing failed"
+                    self.failed.append((rel_path, error))
+                    self.journal.record(rel_path, "processing_failed", error=error)
+                    for duplicate in self.duplicates.pop(rel_path, []):
+                        self._fail_duplicate(duplicate, rel_path)
+                    failed_ids.append(f.id)
+        for file_id in failed_ids:
+            discard_failed(self.asst, file_id)
+
+    def _poll_quietly(self) -> None:
+        try:
+            self.poll()
+        except Exception as e:
+            console.print(f"[dim]Status poll failed, will retry: {e}[/dim]")
+
+    def follow_uploads(self) -> None:
+        """Background thread: poll with backoff while uploads are still running."""
+        delay = POLL_FIRST_S
+        while not self.uploads_done.wait(delay):
+            if self.pending:
+                self._poll_quietly()
+            delay = min(delay * 1.5, POLL_MAX_S)
+
+    def wait(self, timeout_s: float, on_poll=None) -> None:
+        """After the last upload: poll until nothing is pending or `timeout_s` has passed."""
+        deadline = time.monotonic() + timeout_s
+        delay = POLL_FIRST_S
+        while self.pending:
+            self._poll_quietly()
+            if on_poll:
+                on_poll(self)
+            remaining = deadline - time.monotonic()
+            if not self.pending or remaining <= 0:
+                return
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 1.5, POLL_MAX_S)
 
 
 @app.command()
@@ -96,6 +495,19 @@ def main(
         "-m",
         help="Additional metadata as JSON string",
     ),
+    skip_existing: bool = typer.Option(
+        False,
+        "--skip-existing",
+        help="Skip files whose content the assistant already has, and identical copies of the same file",
+    ),
+    concurrency: int = typer.Option(4, "--concurrency", "-c", min=1, help="Files uploaded in parallel"),
+    max_inflight_mb: float = typer.Option(256, "--max-inflight-mb", help="Cap on the total size of files being uploaded at once"),
+    retries: int = typer.Option(3, "--retries", min=0, help="Retries per file for throttled / 5xx / network errors"),
+    wait: bool = typer.Option(False, "--wait", help="Wait until every uploaded file is Available; exit 1 if any fails processing"),
+    wait_timeout: float = typer.Option(1800, "--wait-timeout", help="With --wait: seconds to keep waiting after the last upload"),
+    resume: bool = typer.Option(False, "--resume", help="Continue an interrupted run: skip files its journal records as uploaded"),
+    journal_path: Path = typer.Option(None, "--journal", help="Upload journal (default: ~/.cache/pinecone-assistant/<assistant>.upload-journal.jsonl)"),
+    no_journal: bool = typer.Option(False, "--no-journal", help="Don't write an upload journal"),
 ):
     """Upload documentation files to a Pinecone Assistant.
 
@@ -117,74 +529,187 @@ def main(
     # Parse additional metadata if provided
     extra_metadata = {}
     if metadata_json:
-        import json
         try:
             extra_metadata = json.loads(metadata_json)
         except json.JSONDecodeError:
             console.print("[red]Error: Invalid JSON in --metadata parameter[/red]")
             raise typer.Exit(1)
 
+    journal = None
     try:
         # Initialize Pinecone client
         pc = Pinecone(api_key=api_key, source_tag="claude_code_plugin:assistant")
         asst = pc.assistant.Assistant(assistant_name=assistant)
 
-        # Find files to upload
+        if not Path(source).exists():
+            console.print(f"[red]Error: Path '{source}' does not exist[/red]")
+            raise typer.Exit(1)
+
+        journal = UploadJournal(
+            None if no_journal else (journal_path or CACHE_DIR / f"{assistant}.upload-journal.jsonl"),
+            assistant, source, resume,
+        )
+        completed = journal.completed()
+        if resume:
+            console.print(f"[dim]Resuming: {len(completed)} file(s) already done, "
+                          f"{journal.unfinished()} pending or failed in the journal[/dim]")
+
+        skipped = []  # (rel_path, reason)
+        registry = None
+        if skip_existing:
+            with console.status("[bold blue]Fetching assistant files...[/bold blue]", spinner="dots"):
+                registry = DigestRegistry(remote_digests(asst))
+
+        # Find files to upload. The walk runs on its own thread and feeds the
+        # upload loop, so uploads start while the tree is still being scanned.
         console.print(f"\n[bold]Scanning for documentation files in:[/bold] {source}")
         console.print(f"[dim]Patterns: {', '.join(pattern_list)}[/dim]\n")
 
-        files = find_files(source, pattern_list, exclude_list)
-
-        if not files:
-            console.print("[yellow]No documentation files found matching the specified patterns[/yellow]")
-            console.print("\n[dim]Tip: Pinecone Assistant works with .md, .txt, and .pdf files[/dim]")
-            return
-
-        console.print(f"[green]Found {len(files)} documentation file(s) to upload[/green]\n")
-
-        # Upload files with progress bar
-        uploaded = 0
-        failed = 0
+        # Upload files with progress bar, `concurrency` at a time
+        counts = {"uploaded": 0, "failed": 0}
         failed_files = []
+        found = 0
+        lock = threading.Lock()
+        budget = ByteBudget(int(max_inflight_mb * 1024 * 1024))
+        tracker = ProcessingTracker(asst, journal) if wait else None
+        poller = None
+        if tracker:
+            poller = threading.Thread(target=tracker.follow_uploads, daemon=True)
+            poller.start()
 
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             BarColumn(),
             TaskProgressColumn(),
+            TextColumn("{task.fields[rate]}"),
             console=console,
         ) as progress:
-            task = progress.add_task("[cyan]Uploading files...", total=len(files))
+            task = progress.add_task("[cyan]Scanning and uploading files...", total=None, rate="")
+            discovered = queue.Queue()
+            started = time.monotonic()
 
-            for file_path in files:
+            def walk():
+                count = 0
+                try:
+                    for file_path in iter_files(source, pattern_list, exclude_list):
+                        count += 1
+                        progress.update(task, total=count)
+                        discovered.put(file_path)
+                finally:
+                    discovered.put(None)
+
+            def finished(future, file_path: Path, rel_path: str, size: int):
+                budget.release(size)
+                if future.cancelled():
+                    return  # interrupted before it started; stays pending in the journal
+                record(file_path, rel_path, *outcome_of(future.result))
+
+            def outcome_of(result):
+                """(outcome, detail, digest, error) of an upload_one call; a raised error becomes "failed"."""
                 try:
-                    # Build metadata
+                    return (*result(), None)
+                except Exception as e:
+                    return "failed", str(e), None, e
+
+            def record(file_path: Path, rel_path: str, outcome: str, detail, digest, error=None):
+                """Count and journal one file's outcome, then settle the duplicates parked on it."""
+                if outcome == "unprocessable":
+                    # Identical content would fail processing the same way
+                    outcome, detail = "failed", f"same content as {detail}, which failed processing"
+                with lock:
+                    if outcome == "failed":
+                        counts["failed"] += 1
+                        failed_files.append((str(file_path), detail))
+                        journal.record(rel_path, "failed", error=detail)
+                        progress.update(task, advance=1)
+                    elif outcome == "parked":
+                        pass  # counted once the upload it duplicates settles
+                    elif outcome == "duplicate":
+                        skipped.append((rel_path, f"same content as {detail}"))
+                        journal.record(rel_path, "skipped", digest=digest)
+                        if tracker:
+                            tracker.add_duplicate(rel_path, detail)
+                        progress.update(task, advance=1)
+                    elif outcome == "resumed":
+                        skipped.append((rel_path, detail))
+                        if tracker and journal.entries[rel_path].get("status") == "uploaded" \
+                                and journal.entries[rel_path].get("file_id"):
+                            # Accepted by the interrupted run but never seen Available: wait for it too
+                            tracker.add(journal.entries[rel_path]["file_id"], rel_path, timed=False)
+                        progress.update(task, advance=1)
+                    else:
+                        counts["uploaded"] += 1
+                        journal.record(rel_path, "uploaded", digest=digest, file_id=detail.id)
+                        if tracker:
+                            tracker.add(detail.id, rel_path)
+                        rate = counts["uploaded"] / max(time.monotonic() - started, 1e-6)
+                        progress.update(task, advance=1, description=f"[cyan]Uploaded: {rel_path}", rate=f"{rate:.1f} files/s")
+                if registry is None:
+                    return
+                processing_failed = isinstance(error, ProcessingFailed)
+                for waiter in registry.settle(rel_path, outcome == "uploaded", processing_failed):
+                    waiter_path = Path(source) / waiter
+                    if outcome == "uploaded":
+                        record(waiter_path, waiter, "duplicate", rel_path, digest)
+                    elif processing_failed:
+                        record(waiter_path, waiter, "unprocessable", rel_path, digest)
+                    else:
+                        # The copy it duplicated never made it: upload this one in its place
+                        record(waiter_path, waiter, *outcome_of(lambda: upload_one(
+                            asst, waiter_path, waiter, extra_metadata, registry, retries, not wait, completed)))
+
+            threading.Thread(target=walk, daemon=True).start()
+
+            pool = ThreadPoolExecutor(max_workers=concurrency)
+            try:
+                while (file_path := discovered.get()) is not None:
+                    found += 1
                     rel_path = os.path.relpath(str(file_path), source)
-                    stat = file_path.stat()
-                    metadata = {
-                        "source": "upload_script",
-                        "file_path": rel_path,
-                        "file_type": file_path.suffix,
-                        "content_type": "documentation",
-                        "mtime": stat.st_mtime,
-                        "size": stat.st_size,
-                        "uploaded_at": datetime.now(timezone.utc).isoformat(),
-                        **extra_metadata,
-                    }
-
-                    # Upload file
-                    asst.upload_file(
-                        file_path=str(file_path),
-                        metadata=metadata,
-                        timeout=None,
+                    try:
+                        size = file_path.stat().st_size
+                    except OSError as e:
+                        with lock:
+                            counts["failed"] += 1
+                            failed_files.append((str(file_path), str(e)))
+                            journal.record(rel_path, "failed", error=str(e))
+                            progress.update(task, advance=1)
+                        continue
+                    budget.acquire(size)
+                    if completed.get(rel_path) is None:
+                        journal.record(rel_path, "pending")
+                    future = pool.submit(upload_one, asst, file_path, rel_path, extra_metadata, registry, retries,
+                                         not wait, completed)
+                    future.add_done_callback(
+                        lambda f, file_path=file_path, rel_path=rel_path, size=size: finished(f, file_path, rel_path, size)
                     )
-                    uploaded += 1
-                    progress.update(task, advance=1, description=f"[cyan]Uploaded: {rel_path}")
+                pool.shutdown(wait=True)
+            except KeyboardInterrupt:
+                # Let in-flight uploads finish (and be journaled); drop the queued ones
+                progress.stop()
+                console.print("\n[yellow]Interrupted: finishing uploads already in flight (Ctrl-C again to abort)...[/yellow]")
+                pool.shutdown(wait=True, cancel_futures=True)
+                console.print(f"[yellow]Stopped after {counts['uploaded']} upload(s).[/yellow] "
+                              f"Re-run with [cyan]--resume[/cyan] to upload only what is left.")
+                raise typer.Exit(130)
+
+        if tracker:
+            tracker.uploads_done.set()
+        uploaded = counts["uploaded"]
+        failed = counts["failed"]
+
+        if not found:
+            console.print("[yellow]No documentation files found matching the specified patterns[/yellow]")
+            console.print("\n[dim]Tip: Pinecone Assistant works with .md, .txt, and .pdf files[/dim]")
+            return
 
-                except Exception as e:
-                    failed += 1
-                    failed_files.append((str(file_path), str(e)))
-                    progress.update(task, advance=1)
+        console.print(f"[green]Found {found} documentation file(s)[/green]")
+        if skipped:
+            console.print(f"[dim]Skipped {len(skipped)} file(s) already uploaded or duplicated locally[/dim]")
+            for rel_path, reason in skipped[:10]:
+                console.print(f"  [dim]↷ {rel_path} ({reason})[/dim]")
+            if len(skipped) > 10:
+                console.print(f"  [dim]... and {len(skipped) - 10} more[/dim]")
 
         # Summary table
         console.print()
@@ -193,6 +718,8 @@ def main(
         summary.add_column("Count")
 
         summary.add_row("[green]✓ Uploaded[/green]", str(uploaded))
+        if skipped:
+            summary.add_row("[dim]↷ Skipped (already uploaded)[/dim]", str(len(skipped)))
         if failed > 0:
             summary.add_row("[red]✗ Failed[/red]", str(failed))
 
@@ -203,6 +730,39 @@ def main(
             console.print("\n[bold red]Failed uploads:[/bold red]")
             for file_path, error in failed_files:
                 console.print(f"  • {file_path}: [red]{error}[/red]")
+            if journal.path:
+                console.print("[dim]Re-run with --resume to retry only the failed files[/dim]")
+
+        # Readiness barrier
+        if tracker and tracker.tracked():
+            total = tracker.tracked()
+            with console.status("[bold blue]Waiting for files to finish processing...[/bold blue]", spinner="dots") as status:
+                def show(t):
+                    status.update(f"[bold blue]Processing: {len(t.ready)}/{total} available, "
+                                  f"{len(t.failed)} failed, {len(t.pending)} pending[/bold blue]")
+                poller.join()
+                tracker.wait(wait_timeout, on_poll=show)
+
+            processing = Table(show_header=False, box=None)
+            processing.add_column("Status", style="bold")
+            processing.add_column("Count")
+            processing.add_row("[green]✓ Available[/green]", str(len(tracker.ready)))
+            seconds = [s for s in tracker.ready.values() if s is not None]
+            if seconds:
+                processing.add_row("  time to available p50 / p95 / max",
+                                   f"{percentile(seconds, 0.5):.1f}s / {percentile(seconds, 0.95):.1f}s / {max(seconds):.1f}s")
+            if tracker.failed:
+                processing.add_row("[red]✗ Processing failed[/red]", str(len(tracker.failed)))
+            if tracker.pending:
+                processing.add_row(f"[yellow]… Still processing after {wait_timeout:g}s[/yellow]", str(len(tracker.pending)))
+            console.print(Panel(processing, title="Processing", border_style="blue"))
+
+            if tracker.failed:
+                console.print("\n[bold red]Processing failed:[/bold red]")
+            for rel_path, error in sorted(tracker.failed):
+                console.print(f"  • {rel_path}: [red]{error}[/red]")
+            if tracker.failed or tracker.pending:
+                raise typer.Exit(1)
 
         # Next steps
         if uploaded > 0:
@@ -210,12 +770,18 @@ def main(
 • Chat: [cyan]/pinecone:assistant-chat assistant {assistant} message [your question][/cyan]
 • Context: [cyan]/pinecone:assistant-context assistant {assistant} query [search][/cyan]
 
-[dim]Note: Files are being processed and will be available shortly[/dim]"""
+""" + ("[dim]All files are available[/dim]" if wait else
+       "[dim]Note: Files are being processed and will be available shortly (use --wait to block until they are)[/dim]")
             console.print(Panel(next_steps, title="What's Next?", border_style="green"))
 
+    except typer.Exit:
+        raise
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
         raise typer.Exit(1)
+    finally:
+        if journal:
+            journal.close()
 
 
 if __name__ == "__main__":
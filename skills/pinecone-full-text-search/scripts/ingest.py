@@ -6,24 +6,28 @@
 #   "pinecone==9.0.0",
 # ]
 # ///
-"""Ingest a JSONL file into a Pinecone FTS index — safely.
+"""Ingest JSONL (one file or many compressed shards) into a Pinecone FTS index — safely.
 
 A bare-LLM ingest path skips three things and breaks in three different ways:
 
-  1. Per-doc upsert in a Python loop instead of `batch_upsert`. Slow.
+  1. Per-doc upsert in a Python loop instead of batched requests. Slow.
   2. Discards the upsert response. Silent failures look like success.
   3. Doesn't poll. The HTTP call returns 202 before async indexing finishes,
      so the next search call comes back empty and looks like a query bug.
 
 This script does all three correctly:
 
-  1. Bulk-upserts in batches.
-  2. Inspects every batch result; aborts loudly on any error.
-  3. Polls `documents.search` with a sentinel query until matches appear.
+  1. Bulk-upserts in byte-budgeted batches, streaming the JSONL so memory
+     stays flat.
+  2. Inspects every batch result; retries throttled / 5xx items with backoff,
+     aborts loudly on any permanent error.
+  3. Polls until the load is searchable (a sentinel query by default) before
+     declaring success.
 
-You provide prepared, schema-conformant JSONL + the index name. Schema
-validation belongs upstream;
-this script trusts the input and focuses on getting it indexed safely.
+You provide prepared, schema-conformant JSONL + the index name. The script
+trusts the input by default; `--validate` checks every line against the
+index schema as it's parsed, so a malformed document fails locally instead
+of as a rejected batch thousands of requests in.
 
 Usage:
 
@@ -37,123 +41,1433 @@ Run `--help` for the full flag list.
 
 from __future__ import annotations
 
+import bz2
+import glob
+import gzip
+import hashlib
+import io
 import json
+import math
 import os
+import queue
+import random
+import sqlite3
+import tempfile
+import threading
 import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from enum import Enum
 from pathlib import Path
+from typing import NamedTuple
 
 import typer
-from pinecone import Pinecone
+from pinecone import Pinecone, PineconeConnectionError, RetryConfig
+
+# Fastest available JSON decoder for the JSONL stream. orjson if installed;
+# otherwise msgspec, which the pinecone SDK already depends on; otherwise the
+# stdlib. All three parse the raw bytes line, so there's no str decode step.
+try:
+    import orjson
+
+    JSON_BACKEND = "orjson"
+    _fast_loads = orjson.loads
+except ImportError:
+    try:
+        import msgspec
+
+        JSON_BACKEND = "msgspec"
+        _fast_loads = msgspec.json.Decoder().decode
+    except ImportError:
+        JSON_BACKEND = "json"
+        _fast_loads = json.loads
+
+# zstd decompression is optional: the stdlib's `compression.zstd` on Python
+# 3.14+, else the `zstandard` package if installed. gzip and bz2 always work.
+try:
+    from compression import zstd as _zstd
+except ImportError:
+    try:
+        import zstandard as _zstd
+    except ImportError:
+        _zstd = None
+
+# What counts as a JSONL shard when --data names a directory.
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+COMPRESSED_SUFFIXES = (".gz", ".bz2", ".zst", ".zstd")
+
+# Read buffer for the JSONL stream. Large enough that line-by-line iteration
+# isn't syscall-bound on multi-GB files; small enough not to matter for memory.
+READ_BUFFER_BYTES = 1 << 20
+
+# Per-request cap on `documents.upsert` in 2026-01.alpha is 2 MB and 1,000 docs.
+# The default byte budget leaves headroom for JSON escaping the estimate skips.
+MAX_BATCH_DOCS = 1000
+DEFAULT_BATCH_BYTES = 1_800_000
+
+# Upper bound on one number's JSON text, e.g. "-0.00012345678901234567".
+FLOAT_JSON_BYTES = 24
+
+# Retry backoff for throttled / 5xx batches: full jitter over an exponential
+# ceiling, so parallel workers that were throttled together don't retry together.
+RETRY_BASE_S = 0.5
+RETRY_CAP_S = 30.0
+
+# The client makes one attempt per call (`max_retries` counts attempts in
+# pinecone 9). The SDK's default retries 408/429/5xx itself, out of sight of
+# the rate controller, and would multiply with --max-retries; this script
+# retries in one place instead.
+SDK_RETRY_CONFIG = RetryConfig(max_retries=1)
+
+# Smallest batch byte budget the rate controller will shrink to.
+MIN_BATCH_BYTES = 50_000
+
+# Readiness polling starts fast — small loads are often searchable within a
+# second — and backs off exponentially to the old fixed 5s interval.
+POLL_FIRST_S = 0.25
+POLL_MAX_S = 5.0
+
+# `--poll-mode fetch` checks at most this many IDs from the last batch, and
+# `--poll-mode sample` looks for each sentinel doc in this many top matches.
+FETCH_TAIL_IDS = 100
+SAMPLE_TOP_K = 100
+
+# `--on-duplicate` keeps up to this many `_id` digests in memory (~70 MB as a
+# Python set) before moving them to a temporary SQLite file, so memory stays
+# bounded however many IDs the input holds.
+DEDUP_MEMORY_IDS = 1_000_000
+
+# Field names are limited to 64 bytes; sparse indices are unsigned 32-bit.
+MAX_FIELD_NAME_BYTES = 64
+MAX_SPARSE_INDEX = 2**32 - 1
 
 
 # ---------------------------------------------------------------------------
 # Helpers — small functions, each does one thing.
 # ---------------------------------------------------------------------------
 
-def load_jsonl(path: Path) -> list[dict]:
-    """Read a JSONL file into a list of dicts. Fail loudly on parse errors."""
-    docs: list[dict] = []
-    for lineno, line in enumerate(path.read_text().splitlines(), start=1):
-        line = line.strip()
-        if not line:
-            continue
+def parse_json_line(line: bytes):
+    """Decode one JSONL line with the fast backend, falling back to the stdlib on failure.
+
+    The fallback keeps error messages identical whichever backend is active:
+    a line the fast decoder rejects is re-parsed by `json.loads`, which either
+    raises the familiar `JSONDecodeError` or — for the few inputs the
+    backends disagree on, like a bare `NaN` — accepts it as before.
+    """
+    try:
+        return _fast_loads(line)
+    except ValueError:
+        return json.loads(line)
+
+
+class Record(NamedTuple):
+    """One parsed JSONL line and where it ends in the file."""
+    doc: dict
+    lineno: int
+    end_offset: int  # byte offset just past this line — where a resume would seek to
+
+
+class Batch(NamedTuple):
+    """A packed group of documents from one shard, plus the position of its last line."""
+    docs: list[dict]
+    nbytes: int  # estimated serialized size
+    shard: int  # index into the input list
+    end_offset: int
+    end_lineno: int
+    collapsed: int = 0  # earlier copies of a repeated _id dropped from this batch
+
+
+class ShardDone(NamedTuple):
+    """Marker that follows a shard's last batch through the pipeline."""
+    shard: int
+
+
+def is_jsonl_name(name: str) -> bool:
+    """True for `x.jsonl`, `x.ndjson` and their `.gz` / `.bz2` / `.zst` variants."""
+    name = name.lower()
+    for suffix in COMPRESSED_SUFFIXES:
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+            break
+    return name.endswith(JSONL_SUFFIXES)
+
+
+def expand_inputs(specs: list[str]) -> list[Path]:
+    """Resolve --data values into a de-duplicated list of shard paths.
+
+    Each value may be a file, a directory (every JSONL shard under it, sorted),
+    or a glob such as `exports/part-*.jsonl.zst`.
+    """
+    paths: list[Path] = []
+    for spec in specs:
+        p = Path(spec)
+        if p.is_dir():
+            found = sorted(f for f in p.rglob("*") if f.is_file() and is_jsonl_name(f.name))
+        elif p.is_file():
+            found = [p]
+        else:
+            found = sorted(Path(m) for m in glob.glob(spec, recursive=True) if Path(m).is_file())
+        if not found:
+            raise typer.BadParameter(f"--data {spec!r}: no such file, and no JSONL shards matched")
+        paths.extend(found)
+    return list(dict.fromkeys(paths))
+
+
+def open_jsonl(path: Path, start_offset: int = 0) -> io.BufferedIOBase:
+    """Open a shard for binary line reading, decompressing by suffix, positioned at `start_offset`.
+
+    Offsets always count bytes of the *decompressed* stream. Plain files seek
+    straight there; compressed streams can't, so they decompress and discard
+    up to it — still without parsing any of the skipped JSON.
+    """
+    suffix = path.suffix.lower()
+    if suffix not in COMPRESSED_SUFFIXES:
+        f = path.open("rb", buffering=READ_BUFFER_BYTES)
+        f.seek(start_offset)
+        return f
+    if suffix == ".gz":
+        raw = gzip.open(path, "rb")
+    elif suffix == ".bz2":
+        raw = bz2.open(path, "rb")
+    elif _zstd is None:
+        raise typer.BadParameter(
+            f"{path}: reading .zst needs Python 3.14+ or the `zstandard` package "
+            f"(`uv run --with zstandard --script ingest.py ...`)."
+        )
+    else:
+        raw = _zstd.open(path, "rb")
+    f = io.BufferedReader(raw, READ_BUFFER_BYTES)
+    remaining = start_offset
+    while remaining > 0 and (chunk := f.read(min(remaining, READ_BUFFER_BYTES))):
+        remaining -= len(chunk)
+    return f
+
+
+def iter_jsonl(
+    path: Path,
+    start_offset: int = 0,
+    start_lineno: int = 0,
+    check: Callable[[dict], str | None] | None = None,
+) -> Iterator[Record]:
+    """Stream records from a JSONL shard, one line at a time. Fail loudly on parse errors.
+
+    Why stream:
+        Corpora run to tens of GB. Reading the whole file up front holds the
+        raw text, the split lines and every parsed dict in memory at once.
+        Parsing lazily keeps peak memory at roughly one batch, whatever the
+        file size. Compressed shards are decompressed on the fly, never to disk.
+
+    `start_offset` / `start_lineno` come from a checkpoint: the reader skips
+    straight there, so a resume doesn't re-parse what was already ingested, and
+    line numbers in error messages stay true to the file.
+
+    `check`, if given, sees every parsed document and returns a problem
+    description (or None); a problem fails the stream like bad JSON does.
+    """
+    offset = start_offset
+    with open_jsonl(path, start_offset) as f:
+        for lineno, line in enumerate(f, start=start_lineno + 1):
+            offset += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                doc = parse_json_line(line)
+            except ValueError as e:  # JSONDecodeError, or UnicodeDecodeError on bad UTF-8
+                raise typer.BadParameter(f"{path}:{lineno}: invalid JSON ({getattr(e, 'msg', None) or e})")
+            if check is not None and (problem := check(doc)):
+                raise typer.BadParameter(f"{path}:{lineno}: {problem}")
+            yield Record(doc, lineno, offset)
+
+
+def estimate_json_bytes(value) -> int:
+    """Cheap upper-bound estimate of `value`'s serialized JSON size, in bytes.
+
+    Dense vectors dominate payloads and their size follows from their length,
+    so a list of numbers is priced at `len * FLOAT_JSON_BYTES` without visiting
+    each element. Strings are priced at their UTF-8 length.
+    """
+    if isinstance(value, str):
+        return (len(value) if value.isascii() else len(value.encode())) + 2
+    if isinstance(value, bool) or value is None:
+        return 5
+    if isinstance(value, (int, float)):
+        return FLOAT_JSON_BYTES
+    if isinstance(value, dict):
+        return 2 + sum(len(k) + 4 + estimate_json_bytes(v) for k, v in value.items())
+    if isinstance(value, list):
+        if value and isinstance(value[0], (int, float)) and not isinstance(value[0], bool):
+            return 2 + len(value) * (FLOAT_JSON_BYTES + 1)
+        return 2 + sum(estimate_json_bytes(v) + 1 for v in value)
+    return len(str(value)) + 2
+
+
+def iter_batches(
+    records: Iterable[Record], max_docs: int, max_bytes: int | Callable[[], int], shard: int = 0,
+) -> Iterator[Batch]:
+    """Pack a record stream into batches.
+
+    A batch closes when the next document would push it past `max_bytes`, or
+    when it holds `max_docs` documents — whichever comes first. A single
+    document larger than `max_bytes` travels alone, so one oversized record
+    fails only its own request instead of taking its neighbours down with it.
+
+    `max_bytes` may be a callable, read once per batch, so a `RateController`
+    can shrink or grow batches while the stream is running.
+
+    One request can't carry an `_id` twice — the SDK rejects the whole batch
+    client-side — so a repeat within a batch replaces the earlier copy in
+    place, as the server would have. Repeats across batches are left to
+    `--on-duplicate`.
+    """
+    budget = max_bytes if callable(max_bytes) else lambda: max_bytes
+    limit = budget()
+    batch: list[dict] = []
+    sizes: list[int] = []
+    slots: dict[str, int] = {}  # _id -> position in `batch`
+    batch_bytes = collapsed = 0
+    last: Record | None = None
+    for rec in records:
+        doc_bytes = estimate_json_bytes(rec.doc)
+        if batch and (len(batch) >= max_docs or batch_bytes + doc_bytes > limit):
+            yield Batch(batch, batch_bytes, shard, last.end_offset, last.lineno, collapsed)
+            batch, sizes, slots, batch_bytes, collapsed = [], [], {}, 0, 0
+            limit = budget()
+        doc_id = rec.doc.get("_id")
+        slot = slots.get(doc_id) if isinstance(doc_id, str) else None
+        if slot is not None:
+            batch[slot] = rec.doc
+            batch_bytes += doc_bytes - sizes[slot]
+            sizes[slot] = doc_bytes
+            collapsed += 1
+        else:
+            if isinstance(doc_id, str):
+                slots[doc_id] = len(batch)
+            batch.append(rec.doc)
+            sizes.append(doc_bytes)
+            batch_bytes += doc_bytes
+        last = rec
+    if batch:
+        yield Batch(batch, batch_bytes, shard, last.end_offset, last.lineno, collapsed)
+
+
+def read_shards(
+    shards: list[Path],
+    max_docs: int,
+    max_bytes: int | Callable[[], int],
+    resume: dict | None = None,
+    readers: int = 1,
+    depth: int = 8,
+    check: Callable[[dict], str | None] | None = None,
+    admit: Callable[[Record, int, Path], bool] | None = None,
+) -> Iterator[Batch | ShardDone]:
+    """Parse shards on up to `readers` threads; yield their batches as they're ready.
+
+    Each shard is read by exactly one thread, so its batches — and the
+    `ShardDone` that follows them — come out in file order, which is what the
+    checkpoint relies on. Different shards interleave. A bounded queue of
+    `depth` batches sits between the readers and the consumer, so parsing
+    can't outrun the uploads. A parse error on any reader is re-raised here.
+
+    `resume` is `Checkpoint.load` output: finished shards are skipped and
+    partial ones start from their journalled offset. `check` is passed to
+    `iter_jsonl`, so it runs on the reader threads and must be thread-safe;
+    so does `admit(record, shard, path)`, which drops records it returns False for.
+    """
+    resume = resume or {"shards": {}, "done": []}
+    todo = deque(i for i in range(len(shards)) if i not in resume["done"])
+
+    def read_one(i: int) -> Iterator[Batch | ShardDone]:
+        start = resume["shards"].get(i, {"offset": 0, "lineno": 0})
+        records = iter_jsonl(shards[i], start["offset"], start["lineno"], check)
+        if admit is not None:
+            records = (rec for rec in records if admit(rec, i, shards[i]))
+        yield from iter_batches(records, max_docs, max_bytes, shard=i)
+        yield ShardDone(i)
+
+    if readers <= 1 or len(todo) <= 1:
+        for i in todo:
+            yield from read_one(i)
+        return
+
+    out: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    finished = object()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def reader() -> None:
         try:
-            docs.append(json.loads(line))
-        except json.JSONDecodeError as e:
-            raise typer.BadParameter(f"{path}:{lineno}: invalid JSON ({e.msg})")
-    if not docs:
-        raise typer.BadParameter(f"{path}: file is empty")
-    return docs
+            while todo and not stop.is_set():
+                try:
+                    i = todo.popleft()
+                except IndexError:
+                    break
+                for item in read_one(i):
+                    if not put(item):
+                        return
+        except BaseException as exc:
+            put(exc)
+        finally:
+            put(finished)
+
+    threads = [threading.Thread(target=reader, daemon=True) for _ in range(min(readers, len(todo)))]
+    for t in threads:
+        t.start()
+    try:
+        live = len(threads)
+        while live:
+            item = out.get()
+            if item is finished:
+                live -= 1
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                yield item
+    finally:
+        stop.set()
+
 
+def first_token(doc: dict, field: str) -> str | None:
+    """First whitespace-split token of `doc[field]`, if it is a non-empty string."""
+    val = doc.get(field)
+    if isinstance(val, str) and val.strip():
+        return val.strip().split()[0]
+    return None
 
-def pick_sentinel_token(docs: list[dict], field: str) -> str:
-    """Pick a token from `docs[*][field]` to use as the readiness-poll query.
 
-    A sentinel just needs to match *something* in the freshly-ingested data.
+def pick_sentinel_token(records: Iterable[Record], field: str) -> str:
+    """Check up front that `docs[*][field]` can supply a readiness-poll query.
+
     Scan from the first doc onward and return the first whitespace-split token
     we find — first-doc-is-special datasets (cover pages, header rows, test
-    records with empty bodies) won't make us abort.
+    records with empty bodies) won't make us abort. The scan stops at the first
+    hit, so on a stream it usually costs one line.
+
+    The token polled for is picked again from the first *acknowledged* doc (see
+    `main`): this one comes from the raw stream, before --on-duplicate and
+    --incremental drop docs, and may be from a version of a doc that is never
+    written. It is only the fallback for runs that acknowledge nothing.
     """
-    for doc in docs:
-        val = doc.get(field)
-        if isinstance(val, str) and val.strip():
-            return val.strip().split()[0]
-    sample = ", ".join(sorted(docs[0].keys())) or "(none)"
+    first_keys: list[str] = []
+    scanned = 0
+    for rec in records:
+        doc = rec.doc
+        if not scanned:
+            first_keys = sorted(doc.keys())
+        scanned += 1
+        token = first_token(doc, field)
+        if token:
+            return token
+    sample = ", ".join(first_keys) or "(none)"
     raise typer.BadParameter(
         f"can't auto-pick sentinel: no document has a non-empty string in {field!r} "
-        f"(scanned all {len(docs)} record(s)). Available fields in doc[0]: {sample}. "
+        f"(scanned all {scanned} record(s)). Available fields in doc[0]: {sample}. "
         f"Either fix --sentinel-field, or pass --sentinel TEXT explicitly."
     )
 
 
+def load_schema(pc, index: str, schema_path: Path | None) -> dict[str, dict]:
+    """Return the index schema as `{field_name: {"type": ..., ...}}`, loaded once.
+
+    From `schema_path` if given — the `{"fields": {...}}` dict that
+    `SchemaBuilder().build()` returns, saved as JSON — otherwise from
+    `pc.preview.indexes.describe(index)`.
+    """
+    if schema_path is not None:
+        try:
+            schema = json.loads(schema_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            raise typer.BadParameter(f"--schema {schema_path}: {e}")
+    else:
+        import msgspec  # a pinecone SDK dependency; turns the schema Structs into plain dicts
+
+        schema = msgspec.to_builtins(with_retries(lambda: pc.preview.indexes.describe(index), 5).schema)
+    fields = schema.get("fields", schema) if isinstance(schema, dict) else None
+    if not isinstance(fields, dict) or not all(isinstance(f, dict) for f in fields.values()):
+        raise typer.BadParameter(f"--schema {schema_path}: expected {{\"fields\": {{name: {{\"type\": ...}}}}}}")
+    return fields
+
+
+def check_dense(values, dimension: int | None) -> str | None:
+    """Problem with a dense vector — wrong shape, wrong length, non-numbers, NaN/inf — or None."""
+    if not isinstance(values, list):
+        return f"expected a list of numbers, got {type(values).__name__}"
+    if dimension is not None and len(values) != dimension:
+        return f"dimension {len(values)}, index expects {dimension}"
+    for v in values:
+        if isinstance(v, bool) or not isinstance(v, (int, float)):
+            return "contains a non-number"
+        if not math.isfinite(v):
+            return "contains NaN or infinity"
+    return None
+
+
+def check_sparse(value) -> str | None:
+    """Problem with a sparse vector — missing keys, length mismatch, bad indices — or None."""
+    if not isinstance(value, dict) or not isinstance(value.get("indices"), list) \
+            or not isinstance(value.get("values"), list):
+        return 'expected {"indices": [...], "values": [...]}'
+    indices, values = value["indices"], value["values"]
+    if len(indices) != len(values):
+        return f"{len(indices)} indices but {len(values)} values"
+    if not indices:
+        return None
+    for i in indices:
+        if isinstance(i, bool) or not isinstance(i, int):
+            return "indices must be integers"
+        if not 0 <= i <= MAX_SPARSE_INDEX:
+            return "indices must fit in an unsigned 32-bit integer"
+    problem = check_dense(values, None)
+    return f"values {problem}" if problem else None
+
+
+# Plain-value field types and the Python types their JSON may decode to.
+SCALAR_TYPES: dict[str, tuple[type, ...]] = {
+    "string": (str,),
+    "float": (int, float),
+    "boolean": (bool,),
+}
+
+
+class Validator:
+    """Checks parsed documents against the index schema before they're batched.
+
+    Catches, per line, what the server would otherwise reject per batch:
+
+      - `_id` missing or not a non-empty string
+      - field names starting with `_` or `$`, or longer than 64 bytes
+      - values of the wrong type for a declared field
+      - dense vectors whose length isn't the declared dimension, or that hold
+        non-numbers / NaN / infinity
+      - sparse vectors whose `indices` and `values` differ in length
+
+    Fields the schema doesn't declare are passed through unchecked. Repeated
+    `_id`s are `DuplicateFilter`'s job. Stateless, so safe on the reader threads.
+    """
+
+    def __init__(self, fields: dict[str, dict]):
+        self.fields = fields
+
+    def __call__(self, doc: dict) -> str | None:
+        if not isinstance(doc, dict):
+            return f"expected a JSON object, got {type(doc).__name__}"
+        doc_id = doc.get("_id")
+        if not isinstance(doc_id, str) or not doc_id:
+            return "_id missing or not a non-empty string"
+        for name, value in doc.items():
+            if name == "_id":
+                continue
+            if name[:1] in ("_", "$"):
+                return f"field {name!r}: names starting with '_' or '$' are reserved"
+            if len(name.encode()) > MAX_FIELD_NAME_BYTES:
+                return f"field {name[:20]!r}...: name longer than {MAX_FIELD_NAME_BYTES} bytes"
+            spec = self.fields.get(name)
+            if spec is None or value is None:
+                continue
+            if problem := self.check_value(spec, value):
+                return f"field {name!r}: {problem}"
+        return None
+
+    @staticmethod
+    def check_value(spec: dict, value) -> str | None:
+        kind = spec.get("type")
+        if kind == "dense_vector":
+            return check_dense(value, spec.get("dimension"))
+        if kind == "sparse_vector":
+            return check_sparse(value)
+        if kind == "string_list":
+            if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+                return "expected a list of strings"
+            return None
+        expected = SCALAR_TYPES.get(kind)
+        if expected is None:
+            return None
+        if not isinstance(value, expected) or (kind == "float" and isinstance(value, bool)):
+            return f"expected {kind}, got {type(value).__name__}"
+        return None
+
+
+def id_digest(doc_id) -> int:
+    """8-byte digest of an `_id`, as a signed int (so it also fits an SQLite INTEGER)."""
+    raw = doc_id.encode() if isinstance(doc_id, str) else repr(doc_id).encode()
+    return int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "little", signed=True)
+
+
+class DigestSet:
+    """A set of `_id` digests that spills to a temporary SQLite table when it gets large.
+
+    Up to `max_memory` digests live in a Python set (roughly 70 bytes each);
+    past that they move to an on-disk table inside one never-committed
+    transaction, so lookups stay indexed without fsyncs. The file is removed
+    on `close`. Thread-safe.
+    """
+
+    def __init__(self, max_memory: int = DEDUP_MEMORY_IDS):
+        self.max_memory = max_memory
+        self.spill_path: Path | None = None
+        self._mem: set[int] = set()
+        self._db: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def add(self, digest: int) -> bool:
+        """Add `digest`; True if it wasn't already present."""
+        with self._lock:
+            if self._db is not None:
+                return self._db.execute("INSERT OR IGNORE INTO seen VALUES (?)", (digest,)).rowcount == 1
+            if digest in self._mem:
+                return False
+            self._mem.add(digest)
+            if len(self._mem) > self.max_memory:
+                self._spill()
+            return True
+
+    def _spill(self) -> None:
+        fd, name = tempfile.mkstemp(prefix="ingest-dedup-", suffix=".sqlite")
+        os.close(fd)
+        self.spill_path = Path(name)
+        db = sqlite3.connect(name, check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=OFF")
+        db.execute("PRAGMA synchronous=OFF")
+        db.execute("CREATE TABLE seen (d INTEGER PRIMARY KEY) WITHOUT ROWID")
+        db.execute("BEGIN")
+        db.executemany("INSERT INTO seen VALUES (?)", ((d,) for d in self._mem))
+        self._mem = set()
+        self._db = db
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        if self.spill_path is not None:
+            self.spill_path.unlink(missing_ok=True)
+
+
+class DuplicatePolicy(str, Enum):
+    allow = "allow"
+    error = "error"
+    skip = "skip"
+    last_wins = "last-wins"
+
+
+class DuplicateFilter:
+    """Drops (or rejects) repeated `_id`s before they're batched.
+
+    Upserts replace whole documents, so every repeat of an `_id` is a write
+    whose result is thrown away, and which copy survives depends on request
+    order. Policies:
+
+      - `error`: stop at the first repeat, `path:lineno: duplicate _id ...`.
+      - `skip`: keep the first occurrence, drop later ones.
+      - `last-wins`: keep the last occurrence, drop earlier ones. This needs
+        a pre-pass (`scan`) to learn where each repeated `_id` last appears;
+        only repeated IDs are remembered with a position.
+
+    `admit` runs on the reader threads.
+    """
+
+    def __init__(self, policy: DuplicatePolicy, max_memory: int = DEDUP_MEMORY_IDS):
+        self.policy = policy
+        self.seen = DigestSet(max_memory)
+        self.last: dict[int, tuple[int, int]] = {}  # digest -> (shard, lineno) of its final occurrence
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    def scan(self, shards: list[Path], resume: dict | None = None) -> None:
+        """Read the input once, before uploading, to prime the filter.
+
+        For `last-wins`, every shard is read in full to find each repeated
+        `_id`'s final position. For `error` / `skip` on a resume, the part
+        already ingested is read, so a repeat of an ID sent in the earlier run
+        is still caught.
+        """
+        if self.policy is DuplicatePolicy.last_wins:
+            for i, path in enumerate(shards):
+                for rec in iter_jsonl(path):
+                    digest = id_digest(rec.doc.get("_id"))
+                    if not self.seen.add(digest):
+                        self.last[digest] = (i, rec.lineno)
+            return
+        if not resume:
+            return
+        for i, path in enumerate(shards):
+            stop = None if i in resume["done"] else resume["shards"].get(i, {"offset": 0})["offset"]
+            if stop == 0:
+                continue
+            for rec in iter_jsonl(path):
+                self.seen.add(id_digest(rec.doc.get("_id")))
+                if stop is not None and rec.end_offset >= stop:
+                    break
+
+    def admit(self, rec: Record, shard: int, path: Path) -> bool:
+        """True to send `rec`; False to drop it as a duplicate. Raises under `error`."""
+        doc_id = rec.doc.get("_id")
+        digest = id_digest(doc_id)
+        if self.policy is DuplicatePolicy.last_wins:
+            final = self.last.get(digest)
+            keep = final is None or final == (shard, rec.lineno)
+        elif self.seen.add(digest):
+            keep = True
+        elif self.policy is DuplicatePolicy.error:
+            raise typer.BadParameter(f"{path}:{rec.lineno}: duplicate _id {doc_id!r}")
+        else:
+            keep = False
+        if not keep:
+            with self._lock:
+                self.skipped += 1
+        return keep
+
+    def close(self) -> None:
+        self.seen.close()
+
+
+class Checkpoint:
+    """Append-only journal of acknowledged batches, so an interrupted ingest can `--resume`.
+
+    Line 1 is a header identifying the input shards and the target; every
+    later line records one batch the server acknowledged, or one shard fully
+    ingested, in order:
+
+        {"inputs": [{"path": "...", "size": 123, "mtime_ns": 456}], "index": "...", "namespace": "..."}
+        {"batch": 0, "shard": 0, "offset": 181503, "lineno": 112, "upserted": 112}
+        {"shard": 0, "done": true}
+
+    Batches are journalled in submission order, so each shard's last entry
+    marks a contiguous prefix of that shard that is safely ingested. Offsets
+    count decompressed bytes. A torn final line (the process died mid-write)
+    is ignored on read. A run that gets every batch acknowledged deletes it.
+    """
+
+    def __init__(self, path: Path, header: dict, resume_from: dict | None = None):
+        self.path = path
+        self.batch = resume_from["batch"] + 1 if resume_from else 0
+        # Resuming appends to the existing journal; a fresh run starts a new one.
+        try:
+            self._f = path.open("a" if resume_from else "w", encoding="utf-8")
+        except OSError as e:
+            raise typer.BadParameter(
+                f"can't write the checkpoint journal {path}: {e.strerror or e}. "
+                f"Point --checkpoint at a writable location (the default sits next to the data).",
+                param_hint="--checkpoint",
+            )
+        if not resume_from:
+            self._write(header)
+
+    @staticmethod
+    def header_for(shards: list[Path], index: str, namespace: str) -> dict:
+        inputs = []
+        for shard in shards:
+            st = shard.stat()
+            inputs.append({"path": str(shard.resolve()), "size": st.st_size, "mtime_ns": st.st_mtime_ns})
+        return {"inputs": inputs, "index": index, "namespace": namespace}
+
+    @staticmethod
+    def load(path: Path, header: dict) -> dict | None:
+        """Return the resume state in `path`, or None if nothing was acknowledged.
+
+        The state is `{"batch": last batch index, "upserted": docs so far,
+        "shards": {shard: {"offset", "lineno"}}, "done": [shard, ...]}`.
+
+        Refuses to resume against a journal written for different inputs,
+        inputs that have changed since, or a different index/namespace —
+        byte offsets would point into the wrong data.
+        """
+        state = {"batch": -1, "upserted": 0, "shards": {}, "done": []}
+        with path.open(encoding="utf-8") as f:
+            try:
+                found = json.loads(f.readline())
+            except ValueError:
+                found = None
+            if found != header:
+                raise typer.BadParameter(
+                    f"{path}: checkpoint doesn't match this run (it was written for "
+                    f"{found!r}). Delete it, or run without --resume to start over."
+                )
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # torn write from the interrupted run
+                if entry.get("done"):
+                    state["done"].append(entry["shard"])
+                else:
+                    state["batch"] = entry["batch"]
+                    state["upserted"] = entry["upserted"]
+                    state["shards"][entry["shard"]] = {"offset": entry["offset"], "lineno": entry["lineno"]}
+        return state if state["batch"] >= 0 or state["done"] else None
+
+    def record(self, batch: Batch, upserted: int) -> None:
+        self._write({
+            "batch": self.batch, "shard": batch.shard, "offset": batch.end_offset,
+            "lineno": batch.end_lineno, "upserted": upserted,
+        })
+        self.batch += 1
+
+    def record_done(self, shard: int) -> None:
+        self._write({"shard": shard, "done": True})
+
+    def _write(self, entry: dict) -> None:
+        self._f.write(json.dumps(entry) + "\n")
+        self._f.flush()
+
+    def close(self) -> None:
+        self._f.close()
+
+    def remove(self) -> None:
+        """Delete the journal once the whole input is acknowledged; there is nothing left to resume."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+
+# The encoding `content_hash` digests, as stored in the manifest. It names the
+# bytes, not the library: the stdlib encoder is always used, whichever decoder
+# is installed, so orjson's float formatting or its 64-bit integer limit can't
+# change a hash. Bump it if the encoding ever changes; old hashes are dropped.
+HASH_ENCODING = "json-sorted-compact-utf8/1"
+
+
+def content_hash(doc: dict) -> bytes:
+    """16-byte digest of a document's canonical JSON (sorted keys, no whitespace, UTF-8)."""
+    raw = json.dumps(doc, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(raw.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+class Manifest:
+    """SQLite record of what an index/namespace holds, for `--incremental` runs.
+
+    One row per `_id`: the content hash of the document as last acknowledged,
+    and the run that last saw it in an export. A run marks each unchanged
+    document as seen (it isn't sent), and records changed or new ones only
+    once the server acknowledges their batch. So after an interrupted run, the
+    manifest never claims a write that didn't happen.
+
+    A resumed run keeps the interrupted run's number, so documents it saw
+    before the interruption still count as present for `--delete-missing`.
+    Safe to call from the reader threads and the main thread.
+    """
+
+    def __init__(self, path: Path, index: str, namespace: str, resume: bool = False):
+        self.path = path
+        self.unchanged = 0
+        self._pending: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        with self._db:
+            self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS docs (id TEXT PRIMARY KEY, hash BLOB, run INTEGER) WITHOUT ROWID"
+            )
+        meta = dict(self._db.execute("SELECT key, value FROM meta"))
+        target = {"index": index, "namespace": namespace}
+        if meta.get("index", index) != index or meta.get("namespace", namespace) != namespace:
+            raise typer.BadParameter(
+                f"{path}: manifest belongs to index {meta['index']!r}, namespace "
+                f"{meta['namespace']!r}. Point --manifest elsewhere for {target!r}."
+            )
+        if meta and meta.get("encoding") != HASH_ENCODING:
+            # Hashed some other way (or by a version that keyed them by JSON library); start over.
+            with self._db:
+                self._db.execute("UPDATE docs SET hash = NULL")
+                self._db.execute("DELETE FROM meta WHERE key = 'hasher'")
+        last_run = int(meta.get("run", 0))
+        self.run = last_run if resume and meta.get("open") == "1" else last_run + 1
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                [("index", index), ("namespace", namespace), ("encoding", HASH_ENCODING),
+                 ("run", str(self.run)), ("open", "1")],
+            )
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def admit(self, rec: Record, shard: int, path: Path) -> bool:
+        """True if `rec` is new or changed and must be sent; False if the index already has it."""
+        doc_id = rec.doc.get("_id")
+        if not isinstance(doc_id, str):
+            return True  # let the server report it
+        digest = content_hash(rec.doc)
+        with self._lock:
+            row = self._db.execute("SELECT hash FROM docs WHERE id = ?", (doc_id,)).fetchone()
+            if row is not None and row[0] == digest:
+                self._db.execute("UPDATE docs SET run = ? WHERE id = ?", (self.run, doc_id))
+                self.unchanged += 1
+                return False
+            self._pending[doc_id] = digest
+        return True
+
+    def record(self, batch: Batch) -> None:
+        """Store the hashes of an acknowledged batch."""
+        with self._lock:
+            rows = []
+            for doc in batch.docs:
+                doc_id = doc.get("_id")
+                digest = self._pending.pop(doc_id, None) or content_hash(doc)
+                rows.append((doc_id, digest, self.run))
+            self._db.executemany("INSERT OR REPLACE INTO docs VALUES (?, ?, ?)", rows)
+            self._db.commit()
+
+    def missing(self) -> list[str]:
+        """IDs the manifest holds that this run's export didn't contain."""
+        with self._lock:
+            self._db.commit()
+            return [r[0] for r in self._db.execute("SELECT id FROM docs WHERE run != ?", (self.run,))]
+
+    def forget(self, ids: list[str]) -> None:
+        with self._lock:
+            self._db.executemany("DELETE FROM docs WHERE id = ?", ((i,) for i in ids))
+            self._db.commit()
+
+    def close(self, complete: bool) -> None:
+        """Commit and close. `complete` marks the run finished, so the next one gets a new number."""
+        with self._lock:
+            if complete:
+                self._db.execute("UPDATE meta SET value = '0' WHERE key = 'open'")
+            self._db.commit()
+            self._db.close()
+
+
+def delete_ids(idx, namespace: str, ids: list[str], max_retries: int = 5) -> None:
+    """`documents.delete` in chunks of `MAX_BATCH_DOCS` IDs, the per-call limit."""
+    for i in range(0, len(ids), MAX_BATCH_DOCS):
+        chunk = ids[i : i + MAX_BATCH_DOCS]
+        with_retries(lambda: idx.documents.delete(namespace=namespace, ids=chunk), max_retries)
+
+
+def is_transient(exc: BaseException | None) -> bool:
+    """True for failures worth retrying: throttling (429), server errors (5xx), network trouble.
+
+    Everything else — schema mismatches, reserved field names, payload too
+    large — fails the same way on every attempt, so it aborts immediately.
+    """
+    if exc is None:
+        return False
+    status = getattr(exc, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return isinstance(exc, (TimeoutError, ConnectionError, PineconeConnectionError))
+
+
+def with_retries(fn: Callable[[], object], max_retries: int):
+    """Call `fn`, retrying transient failures with jittered backoff; for the one-off calls around the upserts."""
+    for attempt in range(max_retries + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == max_retries or not is_transient(e):
+                raise
+            time.sleep(random.uniform(0, min(RETRY_CAP_S, RETRY_BASE_S * 2 ** attempt)))
+
+
+class RateController:
+    """AIMD control of in-flight requests and batch size.
+
+    Additive increase: each clean round of acknowledgements (one per slot)
+    opens one more slot, up to `max_concurrency`, and grows the batch byte
+    budget by 10%, up to `max_batch_bytes`.
+
+    Multiplicative decrease: a 429 / 5xx halves both. A latency spike — a clean
+    batch taking more than twice the best seconds-per-MB seen so far — is
+    treated as early congestion and gives back one slot.
+
+    With `adaptive=False` the limits stay pinned at their maximums; retries
+    still happen. It also counts requests actually on the wire, for metrics.
+    Called from worker threads, hence the lock. It only sees throttling
+    because the client doesn't retry on its own (`SDK_RETRY_CONFIG`).
+    """
+
+    def __init__(self, max_concurrency: int, max_batch_bytes: int, adaptive: bool = True):
+        self.max_concurrency = max_concurrency
+        self.max_batch_bytes = max_batch_bytes
+        self.adaptive = adaptive
+        self.concurrency = 1 if adaptive else max_concurrency
+        self.batch_bytes = max_batch_bytes
+        self.in_flight = 0
+        self._acks = 0
+        self._best_s_per_mb: float | None = None
+        self._lock = threading.Lock()
+
+    def request_started(self) -> int:
+        """Count a request going out; returns how many are now in flight, including it."""
+        with self._lock:
+            self.in_flight += 1
+            return self.in_flight
+
+    def request_finished(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def on_success(self, seconds: float, nbytes: int) -> None:
+        if not self.adaptive:
+            return
+        with self._lock:
+            s_per_mb = seconds / max(nbytes / 1e6, 0.01)
+            if self._best_s_per_mb is None or s_per_mb < self._best_s_per_mb:
+                self._best_s_per_mb = s_per_mb
+            if s_per_mb > 2 * self._best_s_per_mb:
+                self.concurrency = max(1, self.concurrency - 1)
+                self._acks = 0
+                return
+            self._acks += 1
+            if self._acks >= self.concurrency:
+                self._acks = 0
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+                self.batch_bytes = min(self.max_batch_bytes, int(self.batch_bytes * 1.1))
+
+    def on_throttle(self) -> None:
+        if not self.adaptive:
+            return
+        with self._lock:
+            self._acks = 0
+            self.concurrency = max(1, self.concurrency // 2)
+            self.batch_bytes = max(MIN_BATCH_BYTES, self.batch_bytes // 2)
+
+
+class Outcome(NamedTuple):
+    """What happened to one batch: total seconds, error messages (empty = success), retries used,
+    and how many requests were in flight when its last attempt went out."""
+    seconds: float
+    errors: list[str]
+    retries: int
+    in_flight: int = 1
+
+
+def upsert_one_batch(
+    idx,
+    namespace: str,
+    batch: Batch,
+    abort: threading.Event,
+    controller: RateController,
+    max_retries: int,
+) -> Outcome | None:
+    """Send one batch as a single `documents.upsert` request, retrying it on transient failures.
+
+    Runs on a worker thread, so it reports instead of printing — the caller
+    prints results in submission order. Returns None without finishing once
+    another batch has failed and set `abort`.
+
+    Why `upsert`, not `batch_upsert`:
+        `batch_upsert` runs its sub-requests on one executor shared by every
+        caller of the index, so with `max_concurrency=1` our workers would
+        queue behind a single thread and `--concurrency` would do nothing.
+        Byte packing already sized the batch for one request, and `upsert`
+        raises `ApiError` (with `status_code`) on failure, which `is_transient`
+        classifies. Permanent errors skip the retry loop and abort the run loudly.
+
+    A retry re-sends the whole batch, including any documents the failed
+    attempt may already have written. Upserts are idempotent on `_id`, so
+    that costs bandwidth, not correctness.
+    """
+    t0 = time.time()
+    attempt = 0
+    while True:
+        if abort.is_set():
+            return None
+        t_attempt = time.time()
+        in_flight = controller.request_started()
+        exc = None
+        try:
+            result = idx.documents.upsert(namespace=namespace, documents=batch.docs)
+            count = getattr(result, "upserted_count", None)
+            error = (
+                None if count is None or count == len(batch.docs)
+                else f"upsert acknowledged {count} of {len(batch.docs)} documents"
+            )
+        except Exception as e:
+            exc, error = e, f"{type(e).__name__}: {e}"
+        finally:
+            controller.request_finished()
+
+        if error is None:
+            controller.on_success(time.time() - t_attempt, batch.nbytes)
+            return Outcome(time.time() - t0, [], attempt, in_flight)
+        if attempt == max_retries or not is_transient(exc):
+            abort.set()
+            return Outcome(time.time() - t0, [error], attempt, in_flight)
+
+        controller.on_throttle()
+        if abort.wait(random.uniform(0, min(RETRY_CAP_S, RETRY_BASE_S * 2 ** attempt))):
+            return None
+        attempt += 1
+
+
 def upsert_batches(
     idx,
     namespace: str,
-    docs: list[dict],
-    batch_size: int,
+    batches: Iterable[Batch | ShardDone],
+    controller: RateController,
+    checkpoint: Checkpoint | None = None,
+    upserted: int = 0,
+    max_retries: int = 5,
+    shard_names: list[str] | None = None,
+    on_ack: Callable[[Batch, Outcome], None] | None = None,
 ) -> int:
-    """Bulk-upsert in batches; abort on the first failed batch.
+    """Bulk-upsert batches in parallel; abort on the first permanent failure.
 
-    Why we inspect the result every time:
-        `batch_upsert` returns 202 even when individual documents fail — the
-        failures are reported in `result.errors` / `result.has_errors`.
+    `batches` is typically the `read_shards` stream, packed against the
+    controller's current byte budget. A thread pool uploads them, keeping at
+    most `controller.concurrency` requests in flight. At most
+    `2 * controller.max_concurrency` batches are parsed-but-unreported at once,
+    so the readers can't run ahead of the network and memory stays bounded.
+    Results are reported — and journalled to `checkpoint` — in the order the
+    batches arrived.
+
+    `upserted` is the count already ingested by an earlier run when resuming;
+    the returned total includes it. With `shard_names`, each line of progress
+    says which shard and line it reached. `on_ack` sees every acknowledged
+    batch, in order, on the caller's thread, before the batch is journalled.
+
+    Why we check every batch:
+        A failed request must stop the run, not scroll past. Each batch's
+        error, or an acknowledged count short of what was sent, is reported
+        here and aborts.
     """
-    upserted = 0
-    for start in range(0, len(docs), batch_size):
-        batch = docs[start:start + batch_size]
-        t0 = time.time()
-        result = idx.documents.batch_upsert(namespace=namespace, documents=batch)
-        elapsed = time.time() - t0
-
-        has_errors = getattr(result, "has_errors", False) or getattr(result, "failed_batch_count", 0)
-        if has_errors:
-            for err in getattr(result, "errors", []) or []:
-                msg = getattr(err, "error_message", None) or str(err)
+    abort = threading.Event()
+    # ShardDone markers ride along with a None future, so they're reported
+    # (and journalled) only once every earlier batch has been acknowledged.
+    window: deque[tuple[Batch | ShardDone, Future | None]] = deque()
+    max_window = 2 * controller.max_concurrency
+    # Once a batch is skipped, later acknowledgements no longer extend a
+    # contiguous prefix, so nothing more may be journalled.
+    journal = checkpoint
+
+    def report_oldest() -> None:
+        nonlocal upserted, journal
+        item, future = window.popleft()
+        if isinstance(item, ShardDone):
+            if journal is not None:
+                journal.record_done(item.shard)
+            if shard_names and not abort.is_set():
+                typer.echo(f"  finished {shard_names[item.shard]}")
+            return
+        outcome = future.result()
+        if outcome is None:
+            journal = None
+            return  # skipped because another batch failed; its errors come next
+        if outcome.errors:
+            for msg in outcome.errors:
                 typer.secho(f"  batch error: {msg}", fg=typer.colors.RED, err=True)
+            if outcome.retries:
+                typer.secho(f"  (gave up after {outcome.retries} retries)", fg=typer.colors.RED, err=True)
             raise typer.Exit(code=1)
-
-        upserted += len(batch)
+        start = upserted
+        upserted += len(item.docs)
+        # on_ack first: it stores the manifest's hashes and run stamps. If we
+        # die between the two, --resume re-sends this batch (harmless), where
+        # journalling first would skip it with the manifest never updated, and
+        # --delete-missing would later delete its docs as gone.
+        if on_ack is not None:
+            on_ack(item, outcome)
+        if journal is not None:
+            journal.record(item, upserted)
+        where = f"; {shard_names[item.shard]}:{item.end_lineno}" if shard_names else ""
+        retried = f", {outcome.retries} retries" if outcome.retries else ""
         typer.echo(
-            f"  batch @{start:>6}: {len(batch):>4} docs in {elapsed:>5.2f}s"
-            f"  (total: {upserted}/{len(docs)})"
+            f"  batch @{start:>6}: {len(item.docs):>4} docs {item.nbytes / 1e6:>5.2f} MB"
+            f" in {outcome.seconds:>5.2f}s  (total: {upserted}{where}; "
+            f"{outcome.in_flight}/{controller.concurrency} in flight{retried})"
         )
+
+    def oldest_ready() -> bool:
+        return bool(window) and (window[0][1] is None or window[0][1].done())
+
+    def wait_for_slot() -> None:
+        while True:
+            while oldest_ready():
+                report_oldest()
+            running = [f for _, f in window if f is not None and not f.done()]
+            if len(running) < controller.concurrency and len(window) < max_window:
+                return
+            if len(window) >= max_window:
+                report_oldest()
+            else:
+                wait(running, return_when=FIRST_COMPLETED)
+
+    with ThreadPoolExecutor(max_workers=controller.max_concurrency) as pool:
+        try:
+            for item in batches:
+                if isinstance(item, ShardDone):
+                    window.append((item, None))
+                    continue
+                wait_for_slot()
+                if abort.is_set():
+                    break
+                window.append((item, pool.submit(
+                    upsert_one_batch, idx, namespace, item, abort, controller, max_retries,
+                )))
+            while window:
+                report_oldest()
+        except BaseException:
+            # Parse error, batch failure or Ctrl-C: stop feeding the pool and
+            # let in-flight requests finish before the error propagates.
+            abort.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
     return upserted
 
 
-def poll_until_searchable(
-    idx,
-    namespace: str,
-    sentinel_field: str,
-    sentinel_token: str,
-    deadline_s: int,
-) -> tuple[float, int]:
-    """Poll `documents.search` until the sentinel query returns matches.
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of `values`, q in 0..1 (0.0 when empty): the smallest value with at least q of them at or below it."""
+    if not values:
+        return 0.0
+    ranked = sorted(values)
+    # ceil, not round: round() is banker's rounding, so p50 of five values picked the 2nd.
+    # The epsilon keeps float noise (0.07 * 100 = 7.000000000000001) from moving up a rank.
+    return ranked[min(len(ranked) - 1, max(0, math.ceil(q * len(ranked) - 1e-9) - 1))]
+
+
+class Metrics:
+    """Machine-readable run metrics: a per-batch JSONL event stream plus a final summary.
+
+    With `events_path`, every acknowledged batch appends one line —
+
+        {"event": "batch", "ts": 1767225600.12, "seq": 0, "docs": 112, "bytes": 1790000,
+         "latency_s": 0.42, "retries": 0, "in_flight": 2}
+
+    — and `finish` appends one `{"event": "summary", ...}` line with p50/p95/p99
+    batch latency, docs/s, MB/s and the poller's indexing lag. `finish` can also
+    write a Prometheus textfile, so cron-driven ingests can alert on throughput
+    regressions via node_exporter's textfile collector.
+    """
+
+    def __init__(self, index: str, namespace: str, events_path: Path | None = None):
+        self.labels = {"index": index, "namespace": namespace}
+        self.latencies: list[float] = []
+        self.docs = 0
+        self.bytes = 0
+        self.retries = 0
+        self._f = events_path.open("w", encoding="utf-8") if events_path else None
+
+    def on_batch(self, batch: Batch, outcome: Outcome) -> None:
+        self.latencies.append(outcome.seconds)
+        self.docs += len(batch.docs)
+        self.bytes += batch.nbytes
+        self.retries += outcome.retries
+        self._write({
+            "event": "batch", "ts": round(time.time(), 3), "seq": len(self.latencies) - 1,
+            "docs": len(batch.docs), "bytes": batch.nbytes, "latency_s": round(outcome.seconds, 4),
+            "retries": outcome.retries, "in_flight": outcome.in_flight,
+        })
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile of batch latency, in seconds (0.0 with no batches)."""
+        return percentile(self.latencies, q)
+
+    def finish(
+        self,
+        status: str,
+        upsert_seconds: float,
+        poll: PollResult | None = None,
+        prom_path: Path | None = None,
+    ) -> dict:
+        """Write the summary event (and the Prometheus textfile, if asked) and return the summary."""
+        summary = {
+            "event": "summary", "ts": round(time.time(), 3), "status": status, **self.labels,
+            "docs": self.docs, "bytes": self.bytes, "batches": len(self.latencies),
+            "retries": self.retries, "upsert_s": round(upsert_seconds, 3),
+            "latency_p50_s": round(self.percentile(0.50), 4),
+            "latency_p95_s": round(self.percentile(0.95), 4),
+            "latency_p99_s": round(self.percentile(0.99), 4),
+            "docs_per_s": round(self.docs / upsert_seconds, 1) if upsert_seconds else 0.0,
+            "mb_per_s": round(self.bytes / 1e6 / upsert_seconds, 3) if upsert_seconds else 0.0,
+            "indexing_lag_s": round(poll.seconds, 3) if poll else None,
+            "poll_curve": [[round(t, 3), round(f, 4)] for t, f in poll.curve] if poll else [],
+        }
+        self._write(summary)
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+        if prom_path is not None:
+            self.write_prometheus(prom_path, summary)
+        return summary
+
+    def write_prometheus(self, path: Path, summary: dict) -> None:
+        """Write `summary` in Prometheus text exposition format, atomically (temp file + rename)."""
+        labels = ",".join(f'{k}="{v}"' for k, v in self.labels.items())
+        gauges = [
+            ("success", "1 if the last ingest completed and became searchable", int(summary["status"] == "ok")),
+            ("last_run_timestamp_seconds", "Unix time the last ingest finished", summary["ts"]),
+            ("docs", "Documents upserted by the last run", summary["docs"]),
+            ("bytes", "Estimated payload bytes upserted by the last run", summary["bytes"]),
+            ("retries", "Batch retries in the last run", summary["retries"]),
+            ("upsert_seconds", "Wall-clock upsert time of the last run", summary["upsert_s"]),
+            ("docs_per_second", "Upsert throughput of the last run", summary["docs_per_s"]),
+            ("megabytes_per_second", "Upsert throughput of the last run", summary["mb_per_s"]),
+        ]
+        if summary["indexing_lag_s"] is not None:
+            gauges.append(("indexing_lag_seconds", "Upsert end to searchable", summary["indexing_lag_s"]))
+        lines = []
+        for name, help_text, value in gauges:
+            lines += [
+                f"# HELP pinecone_ingest_{name} {help_text}",
+                f"# TYPE pinecone_ingest_{name} gauge",
+                f"pinecone_ingest_{name}{{{labels}}} {value}",
+            ]
+        lines += [
+            "# HELP pinecone_ingest_batch_latency_seconds batch upsert latency in the last run",
+            "# TYPE pinecone_ingest_batch_latency_seconds summary",
+        ]
+        for q in ("0.5", "0.95", "0.99"):
+            lines.append(f'pinecone_ingest_batch_latency_seconds{{{labels},quantile="{q}"}} {self.percentile(float(q))}')
+        lines += [
+            f"pinecone_ingest_batch_latency_seconds_sum{{{labels}}} {sum(self.latencies)}",
+            f"pinecone_ingest_batch_latency_seconds_count{{{labels}}} {len(self.latencies)}",
+        ]
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        tmp.replace(path)
+
+    def _write(self, event: dict) -> None:
+        if self._f is not None:
+            self._f.write(json.dumps(event) + "\n")
+            self._f.flush()
+
+
+class PollMode(str, Enum):
+    search = "search"
+    fetch = "fetch"
+    sample = "sample"
+
+
+class PollResult(NamedTuple):
+    """How a readiness poll went: total seconds, probe rounds, and (seconds, fraction ready) per round."""
+    seconds: float
+    probes: int
+    curve: list[tuple[float, float]]
+
+
+class SentinelSample:
+    """Reservoir sample of (_id, token) pairs over acknowledged documents, for `--poll-mode sample`.
+
+    Reservoir sampling keeps `size` documents drawn uniformly from the whole
+    stream without knowing its length, so the sentinels spread from the first
+    batch to the last. Each carries the longest token of its sentinel field:
+    long tokens are usually rare, so the doc should rank in the top-k for its
+    own query; `sample_probe` falls back to fetching the ones whose token isn't.
+    """
+
+    def __init__(self, field: str, size: int):
+        self.field = field
+        self.size = size
+        self.items: list[tuple[str, str]] = []
+        self._seen = 0
+
+    def observe(self, batch: Batch, outcome: Outcome) -> None:
+        for doc in batch.docs:
+            val = doc.get(self.field)
+            if not (isinstance(val, str) and val.strip()):
+                continue
+            self._seen += 1
+            slot = len(self.items) if len(self.items) < self.size else random.randrange(self._seen)
+            if slot < self.size:
+                entry = (doc["_id"], max(val.split(), key=len))
+                if slot == len(self.items):
+                    self.items.append(entry)
+                else:
+                    self.items[slot] = entry
+
+
+def poll(probe: Callable[[], float], deadline_s: int, show_curve: bool = False) -> PollResult:
+    """Call `probe` until it reports 1.0 (everything ready), backing off between rounds.
+
+    `probe` returns the fraction of its targets that are ready. Rounds start
+    `POLL_FIRST_S` apart and double up to `POLL_MAX_S`, so a load that is
+    searchable after a second is noticed after a second, while a slow one
+    isn't hammered. Raises `typer.Exit(1)` at the deadline.
 
     Why this exists:
-        After `batch_upsert` returns, Pinecone is still building the inverted
+        After an upsert returns, Pinecone is still building the inverted
         index. A search call that arrives during that window comes back empty.
         Without this poll, the user sees an empty `documents.search` and
         debugs their *query*, never noticing it was an indexing race.
-
-    Returns:
-        (seconds_elapsed, number_of_probes)
     """
     start = time.time()
     deadline = start + deadline_s
-    probes = 0
+    delay = POLL_FIRST_S
+    curve: list[tuple[float, float]] = []
     while time.time() < deadline:
-        probes += 1
+        try:
+            fraction = probe()
+        except Exception as e:
+            if not is_transient(e):
+                raise
+            fraction = curve[-1][1] if curve else 0.0  # a throttled or failed probe tells us nothing new
+        elapsed = time.time() - start
+        curve.append((elapsed, fraction))
+        if show_curve:
+            typer.echo(f"  t={elapsed:>6.1f}s  {fraction:>6.1%} searchable")
+        if fraction >= 1.0:
+            return PollResult(elapsed, len(curve), curve)
+        time.sleep(min(delay, max(0.0, deadline - time.time())))
+        delay = min(delay * 2, POLL_MAX_S)
+
+    raise typer.Exit(code=1)
+
+
+def search_probe(idx, namespace: str, sentinel_field: str, sentinel_token: str) -> Callable[[], float]:
+    """Probe: does the sentinel query return any match yet?"""
+    def probe() -> float:
         resp = idx.documents.search(
             namespace=namespace,
             top_k=1,
             score_by=[{"type": "text", "field": sentinel_field, "query": sentinel_token}],
             include_fields=[],  # required on every search; [] = lightest payload
         )
-        if resp.matches:
-            return time.time() - start, probes
-        time.sleep(5)
+        return 1.0 if resp.matches else 0.0
+    return probe
 
-    raise typer.Exit(code=1)
+
+def fetch_probe(idx, namespace: str, ids: list[str]) -> Callable[[], float]:
+    """Probe: what fraction of `ids` — the tail of the load — does `documents.fetch` return?"""
+    def probe() -> float:
+        resp = idx.documents.fetch(namespace=namespace, ids=ids, include_fields=[])
+        return len(resp.documents) / len(ids)
+    return probe
+
+
+def sample_probe(idx, namespace: str, field: str, sample: list[tuple[str, str]]) -> Callable[[], float]:
+    """Probe: what fraction of the sampled docs show up in search for their own token?
+
+    A doc counts only when its own `_id` comes back. If its token fills a whole
+    page of `SAMPLE_TOP_K` matches without it — boilerplate shared by more docs
+    than one page holds — search can't single it out, so from then on it is
+    confirmed by `documents.fetch` of its ID instead. A sentinel that has been
+    found stays found, so each round only re-queries the ones still pending.
+    """
+    pending = dict(sample)
+    by_fetch: set[str] = set()
+
+    def probe() -> float:
+        for doc_id, token in list(pending.items()):
+            if doc_id in by_fetch:
+                continue
+            resp = idx.documents.search(
+                namespace=namespace,
+                top_k=SAMPLE_TOP_K,
+                score_by=[{"type": "text", "field": field, "query": token}],
+                include_fields=[],
+            )
+            if any(getattr(m, "_id", None) == doc_id for m in resp.matches):
+                del pending[doc_id]
+            elif len(resp.matches) >= SAMPLE_TOP_K:
+                by_fetch.add(doc_id)
+        waiting = [doc_id for doc_id in pending if doc_id in by_fetch]
+        for i in range(0, len(waiting), FETCH_TAIL_IDS):
+            resp = idx.documents.fetch(namespace=namespace, ids=waiting[i : i + FETCH_TAIL_IDS], include_fields=[])
+            for doc_id in resp.documents:
+                pending.pop(doc_id, None)
+        return 1 - len(pending) / len(sample)
+    return probe
 
 
 def resolve_index_with_retry(pc, name: str, *, deadline_s: int = 60):
@@ -192,10 +1506,11 @@ app = typer.Typer(
 
 @app.command()
 def main(
-    data: Path = typer.Option(
+    data: list[str] = typer.Option(
         ..., "--data", "-d",
-        exists=True, dir_okay=False, readable=True,
-        help="Path to JSONL of prepared, schema-conformant documents (one per line).",
+        help="JSONL of prepared, schema-conformant documents (one per line). A file, a "
+             "directory of shards, or a quoted glob like 'part-*.jsonl.zst'; repeatable. "
+             ".gz / .bz2 / .zst shards are decompressed while streaming.",
     ),
     index: str = typer.Option(
         ..., "--index", "-i",
@@ -211,69 +1526,318 @@ def main(
         help="Index namespace.",
     ),
     batch_size: int = typer.Option(
-        100, "--batch-size", "-b", min=1, max=200,
-        help="Documents per batch_upsert call. Reduce if your dense vectors are large "
-             "(e.g. 50 for dim=3072) and you hit payload-size errors.",
+        MAX_BATCH_DOCS, "--batch-size", "-b", min=1, max=MAX_BATCH_DOCS,
+        help="Maximum documents per upsert request. Batches close earlier when "
+             "--batch-bytes is reached, so there's rarely a reason to lower this.",
+    ),
+    batch_bytes: int = typer.Option(
+        DEFAULT_BATCH_BYTES, "--batch-bytes", min=MIN_BATCH_BYTES, max=2_000_000,
+        help="Maximum estimated serialized bytes per upsert request. Dense vectors "
+             "are priced from their dimension, so large embeddings get smaller batches "
+             "automatically.",
+    ),
+    concurrency: int = typer.Option(
+        8, "--concurrency", "-c", min=1, max=64,
+        help="Maximum upsert requests in flight at once. The rate controller ramps "
+             "up to this and backs off on throttling.",
+    ),
+    adaptive: bool = typer.Option(
+        True, "--adaptive/--no-adaptive",
+        help="AIMD rate control: grow concurrency and batch size while requests are "
+             "clean, halve both on 429/5xx. --no-adaptive pins them at the maximums.",
+    ),
+    max_retries: int = typer.Option(
+        5, "--max-retries", min=0, max=20,
+        help="Retries for batches that fail with 429, 5xx or a network error. A retry "
+             "re-sends the whole batch, including docs the failed attempt may have "
+             "written (upserts are idempotent). The SDK's own retries are off, so this "
+             "is the only retry layer. Permanent errors (schema mismatch, reserved "
+             "field names) never retry.",
+    ),
+    readers: int = typer.Option(
+        4, "--readers", min=1, max=32,
+        help="Shards parsed in parallel when --data matches more than one file.",
+    ),
+    validate: bool = typer.Option(
+        False, "--validate",
+        help="Check every document against the index schema while parsing: _id present "
+             "and unique, no '_' / '$' field names or names over 64 bytes, declared field "
+             "types, dense vector dimension, sparse indices/values parity. Stops at the "
+             "first bad line, before its batch is sent.",
+    ),
+    schema_path: Path | None = typer.Option(
+        None, "--schema",
+        exists=True, dir_okay=False,
+        help="JSON schema for --validate, as SchemaBuilder().build() returns it "
+             "({\"fields\": {...}}). Default: read from the index with indexes.describe.",
+    ),
+    on_duplicate: DuplicatePolicy | None = typer.Option(
+        None, "--on-duplicate",
+        help="What to do with repeated _ids. allow: send them all; a repeat within one "
+             "batch replaces the earlier copy (a request can't repeat an _id), and across "
+             "batches the last one the server applies wins. error: stop at the first repeat. skip: keep the first. "
+             "last-wins: keep the last, after a pre-pass over the input. "
+             "Default: error with --validate, else allow.",
+    ),
+    incremental: bool = typer.Option(
+        False, "--incremental",
+        help="Only send documents that are new or changed since the last --incremental run "
+             "into this index/namespace, by content hash (see --manifest).",
+    ),
+    manifest_path: Path | None = typer.Option(
+        None, "--manifest",
+        dir_okay=False,
+        help="SQLite manifest of _id -> content hash for --incremental. "
+             "Default: <index>.<namespace>.manifest in the current directory.",
+    ),
+    delete_missing: bool = typer.Option(
+        False, "--delete-missing",
+        help="With --incremental: after a complete run, delete documents that earlier "
+             "runs ingested but this export no longer contains.",
+    ),
+    checkpoint_path: Path | None = typer.Option(
+        None, "--checkpoint",
+        dir_okay=False,
+        help="Journal of acknowledged batches. Default: <data>.checkpoint next to a "
+             "single input, or <index>.<namespace>.checkpoint for several.",
+    ),
+    resume: bool = typer.Option(
+        False, "--resume",
+        help="Continue an interrupted ingest from its checkpoint, seeking past the "
+             "batches it already acknowledged.",
     ),
     poll_deadline: int = typer.Option(
         300, "--poll-deadline", min=10, max=3600,
         help="Seconds to wait for docs to become searchable before giving up.",
     ),
+    poll_mode: PollMode = typer.Option(
+        PollMode.search, "--poll-mode",
+        help="Readiness check. search: one sentinel query matches. fetch: the last "
+             "batch's _ids come back from documents.fetch. sample: --poll-sample docs "
+             "spread across the load are each searchable; prints the fraction over time.",
+    ),
+    poll_sample: int = typer.Option(
+        16, "--poll-sample", min=1, max=1000,
+        help="Sentinel documents to sample for --poll-mode sample.",
+    ),
     sentinel: str | None = typer.Option(
         None, "--sentinel", "-s",
         help="Token used for the readiness-poll query. "
-             "Default: first word of doc[0][sentinel-field].",
+             "Default: first word of sentinel-field in the first acknowledged doc.",
+    ),
+    metrics_json: Path | None = typer.Option(
+        None, "--metrics-json",
+        dir_okay=False,
+        help="Write one JSON line per acknowledged batch (latency, bytes, docs, retries, "
+             "in-flight) and a final summary line with latency percentiles, throughput "
+             "and indexing lag.",
+    ),
+    metrics_prom: Path | None = typer.Option(
+        None, "--metrics-prom",
+        dir_okay=False,
+        help="Write the run summary as a Prometheus textfile (for node_exporter's "
+             "textfile collector). Replaced atomically, including on failure.",
     ),
 ):
     """Bulk-ingest prepared documents into a Pinecone FTS index.
 
     [bold]Pipeline[/bold]
 
-      1. Load JSONL.
-      2. `batch_upsert` in batches; abort on any batch error.
-      3. Poll `documents.search` with a sentinel query until matches appear.
-      4. Report timings.
+      1. Stream JSONL shards line by line, decompressing on the fly (memory stays
+         at about one batch per reader).
+      2. One `documents.upsert` per batch, in parallel under AIMD rate control; retry 429/5xx
+         with jittered backoff, abort on any permanent batch error.
+         Every acknowledged batch is journalled, so [bold]--resume[/bold] can pick up
+         where an interrupted run stopped.
+      3. Poll until the load is searchable — a sentinel query, a fetch of the last
+         batch, or a sample of sentinels across the load — backing off from 0.25s.
+      4. Report timings — and, with [bold]--metrics-json[/bold] / [bold]--metrics-prom[/bold],
+         write them in machine-readable form.
 
     [bold]Required[/bold]: PINECONE_API_KEY in the environment, an existing
     index named [bold]--index[/bold], and prepared JSONL at [bold]--data[/bold].
     """
     if not os.environ.get("PINECONE_API_KEY"):
         raise typer.Exit("PINECONE_API_KEY not set in environment.")
+    if delete_missing and not incremental:
+        raise typer.BadParameter("--delete-missing needs --incremental (the manifest is what it compares against)")
 
-    typer.echo(f"Loading {data} ...")
-    docs = load_jsonl(data)
-    typer.echo(f"Loaded {len(docs)} document(s).")
+    shards = expand_inputs(data)
+    size_mb = sum(p.stat().st_size for p in shards) / 1e6
+    label = str(shards[0]) if len(shards) == 1 else f"{len(shards)} shards"
+    typer.echo(f"Streaming {label} ({size_mb:,.1f} MB on disk, {JSON_BACKEND} decoder) ...")
 
+    fallback_sentinel = None
     if sentinel is None:
-        sentinel = pick_sentinel_token(docs, sentinel_field)
-    typer.echo(f"Sentinel: {sentinel_field}={sentinel!r}")
+        fallback_sentinel = pick_sentinel_token(
+            (rec for shard in shards for rec in iter_jsonl(shard)), sentinel_field,
+        )
+        typer.echo(f"Sentinel: first token of {sentinel_field!r} in the first acknowledged doc")
+    else:
+        typer.echo(f"Sentinel: {sentinel_field}={sentinel!r}")
 
-    pc = Pinecone(source_tag="pinecone_skills:full_text_search_ingest")  # reads PINECONE_API_KEY
+    pc = Pinecone(  # reads PINECONE_API_KEY
+        source_tag="pinecone_skills:full_text_search_ingest", retry_config=SDK_RETRY_CONFIG,
+    )
     idx = resolve_index_with_retry(pc, index)
 
-    typer.echo(f"\nUpserting in batches of {batch_size} ...")
+    validator = None
+    if validate:
+        validator = Validator(load_schema(pc, index, schema_path))
+        typer.echo(f"Validating against {len(validator.fields)} schema field(s).")
+
+    if checkpoint_path is None:
+        checkpoint_path = (
+            shards[0].with_name(shards[0].name + ".checkpoint") if len(shards) == 1
+            else Path(f"{index}.{namespace}.checkpoint")
+        )
+    header = Checkpoint.header_for(shards, index, namespace)
+    resume_from = None
+    if resume:
+        if checkpoint_path.exists():
+            resume_from = Checkpoint.load(checkpoint_path, header)
+        if resume_from is None:
+            typer.echo(f"Nothing acknowledged in {checkpoint_path}; starting from the beginning.")
+        else:
+            typer.echo(
+                f"Resuming: {resume_from['upserted']} doc(s) already ingested, "
+                f"{len(resume_from['done'])}/{len(shards)} shard(s) finished."
+            )
+    checkpoint = Checkpoint(checkpoint_path, header, resume_from)
+
+    if on_duplicate is None:
+        on_duplicate = DuplicatePolicy.error if validate else DuplicatePolicy.allow
+    dedup = None
+    if on_duplicate is not DuplicatePolicy.allow:
+        dedup = DuplicateFilter(on_duplicate)
+        if on_duplicate is DuplicatePolicy.last_wins:
+            typer.echo("Scanning for repeated _ids (last-wins pre-pass) ...")
+        dedup.scan(shards, resume_from)
+
+    manifest = None
+    if incremental:
+        manifest = Manifest(manifest_path or Path(f"{index}.{namespace}.manifest"), index, namespace, resume)
+        typer.echo(f"Incremental: {len(manifest)} _id(s) in {manifest.path} (run {manifest.run}).")
+    filters = [f.admit for f in (dedup, manifest) if f is not None]
+
+    controller = RateController(concurrency, batch_bytes, adaptive)
+    typer.echo(
+        f"\nUpserting in batches of up to {batch_size} docs / {batch_bytes / 1e6:.1f} MB, "
+        f"up to {concurrency} in flight{' (adaptive)' if adaptive else ''} ..."
+    )
     t_upsert_start = time.time()
-    upserted = upsert_batches(idx, namespace, docs, batch_size)
+    last_ids: list[str] = []
+    picked: list[str] = []  # the auto-picked sentinel token, once a batch is acknowledged
+    collapsed = 0  # repeats of an _id within one batch, sent as the last copy
+    sample = SentinelSample(sentinel_field, poll_sample)
+    metrics = Metrics(index, namespace, metrics_json)
+
+    def on_ack(batch: Batch, outcome: Outcome) -> None:
+        nonlocal collapsed
+        collapsed += batch.collapsed
+        metrics.on_batch(batch, outcome)
+        if manifest is not None:
+            manifest.record(batch)
+        if sentinel is None and not picked:
+            token = next(filter(None, (first_token(doc, sentinel_field) for doc in batch.docs)), None)
+            if token:
+                picked.append(token)
+        if poll_mode is PollMode.fetch:
+            last_ids[:] = [doc["_id"] for doc in batch.docs[-FETCH_TAIL_IDS:]]
+        elif poll_mode is PollMode.sample:
+            sample.observe(batch, outcome)
+
+    streamed = False
+    try:
+        batches = read_shards(
+            shards, batch_size, lambda: controller.batch_bytes, resume_from,
+            readers, depth=2 * concurrency, check=validator,
+            admit=(lambda rec, i, path: all(f(rec, i, path) for f in filters)) if filters else None,
+        )
+        upserted = upsert_batches(
+            idx, namespace, batches, controller, checkpoint,
+            resume_from["upserted"] if resume_from else 0, max_retries,
+            shard_names=[p.name for p in shards] if len(shards) > 1 else None,
+            on_ack=on_ack,
+        )
+        streamed = True
+    except (typer.Exit, typer.BadParameter, KeyboardInterrupt):
+        metrics.finish("failed", time.time() - t_upsert_start, prom_path=metrics_prom)
+        typer.secho(
+            f"\nIngest stopped. Acknowledged batches are journalled in {checkpoint_path}; "
+            f"fix the cause and re-run with --resume to continue from there.",
+            fg=typer.colors.YELLOW, err=True,
+        )
+        raise
+    finally:
+        if streamed:
+            checkpoint.remove()
+        else:
+            checkpoint.close()
+        if dedup is not None:
+            dedup.close()
+        if manifest is not None and not streamed:
+            manifest.close(complete=False)  # keep the run open, so --resume reuses its number
+    if not upserted and not (manifest and manifest.unchanged):
+        metrics.finish("failed", time.time() - t_upsert_start, prom_path=metrics_prom)
+        raise typer.BadParameter(f"{', '.join(data)}: no documents found")
     upsert_seconds = time.time() - t_upsert_start
     typer.echo(f"\nUpsert complete: {upserted} doc(s) in {upsert_seconds:.1f}s.")
+    if collapsed:
+        typer.echo(f"Collapsed {collapsed} repeated _id(s) within a batch; the last copy was sent.")
+    if dedup is not None and dedup.skipped:
+        typer.echo(f"Skipped {dedup.skipped} write(s) of repeated _ids (--on-duplicate {on_duplicate.value}).")
+    if manifest is not None:
+        typer.echo(f"Skipped {manifest.unchanged} unchanged doc(s) (--incremental).")
+        if delete_missing:
+            gone = manifest.missing()
+            if gone:
+                typer.echo(f"Deleting {len(gone)} doc(s) missing from this export ...")
+                delete_ids(idx, namespace, gone, max_retries)
+                manifest.forget(gone)
+        manifest.close(complete=True)
+        if not metrics.docs:
+            metrics.finish("ok", upsert_seconds, prom_path=metrics_prom)
+            typer.echo("Nothing new or changed since the last run; skipping the readiness poll.")
+            return
+
+    if sentinel is None:
+        sentinel = picked[0] if picked else fallback_sentinel
+    if poll_mode is PollMode.fetch and last_ids:
+        what = f"last batch's {len(last_ids)} _id(s) via documents.fetch"
+        probe = fetch_probe(idx, namespace, last_ids)
+    elif poll_mode is PollMode.sample and sample.items:
+        what = f"{len(sample.items)} sampled sentinel(s) in {sentinel_field!r}"
+        probe = sample_probe(idx, namespace, sentinel_field, sample.items)
+    else:
+        if poll_mode is not PollMode.search:
+            typer.echo(f"(nothing acknowledged this run to {poll_mode.value}-poll; using the sentinel query)")
+        what = f"sentinel {sentinel_field}={sentinel!r}"
+        probe = search_probe(idx, namespace, sentinel_field, sentinel)
 
-    typer.echo(f"\nPolling for searchability (deadline {poll_deadline}s) ...")
+    typer.echo(f"\nPolling for searchability: {what} (deadline {poll_deadline}s) ...")
     try:
-        poll_seconds, probes = poll_until_searchable(
-            idx, namespace, sentinel_field, sentinel, poll_deadline,
-        )
+        polled = poll(probe, poll_deadline, show_curve=poll_mode is PollMode.sample)
     except typer.Exit:
+        metrics.finish("failed", upsert_seconds, prom_path=metrics_prom)
         typer.secho(
-            f"\nDocs not searchable within {poll_deadline}s. "
-            f"Sentinel: {sentinel_field}={sentinel!r}. "
+            f"\nDocs not searchable within {poll_deadline}s ({what}). "
             f"Possible causes: sentinel field isn't FTS-enabled on this index; "
             f"the upserts succeeded structurally but the documents themselves were "
             f"rejected by the inverted-index builder; the deadline is too tight.",
             fg=typer.colors.RED, err=True,
         )
         raise
+    poll_seconds = polled.seconds
 
-    typer.echo(f"Searchable after {poll_seconds:.1f}s ({probes} probe(s)).")
+    typer.echo(f"Searchable after {poll_seconds:.1f}s ({polled.probes} probe(s)).")
+    summary = metrics.finish("ok", upsert_seconds, polled, metrics_prom)
+    if metrics.latencies:
+        typer.echo(
+            f"Batch latency p50/p95/p99: {summary['latency_p50_s']:.2f}/"
+            f"{summary['latency_p95_s']:.2f}/{summary['latency_p99_s']:.2f}s; "
+            f"{summary['docs_per_s']:,.0f} docs/s, {summary['mb_per_s']:.2f} MB/s."
+        )
     typer.echo(f"\nDone — total {upsert_seconds + poll_seconds:.1f}s.")
 
 
@@ -0,0 +1,601 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#   "typer>=0.12",
+#   "rich>=13.0.0",
+#   "pinecone==9.0.0",
+# ]
+# ///
+"""Benchmark the skills' scripts offline, against local fake backends, and compare to a baseline.
+
+The scripts carry performance advice — batch sizes, worker counts, poll
+intervals — and this harness is what keeps that advice honest. Nothing here
+touches the network: the full-text-search scripts run against
+`fake_index.py`, the assistant scripts against an in-process fake assistant
+defined below, and corpora / source trees are generated into a temp dir.
+
+Suites (`--only` picks some):
+
+  ingest      JSONL parse and batch packing throughput per corpus shape;
+              a check that upsert requests really overlap through the SDK's
+              documents client; upload throughput swept over batch size x
+              concurrency, with and without adaptive rate control (also
+              through the SDK's client, with the fake index behind it); a
+              full CLI run with 429s and 503s injected; readiness-poll
+              overshoot vs. a fixed 5s poll.
+  sync        Local scan and full plan (`sync.py --dry-run`) on a large tree.
+  upload      File discovery (`upload.py` `find_files`) on the same tree.
+  assistant   `list.py --files --json` and `context.py --json` round trips.
+
+Results are written as JSON (`--out`). `--compare BASELINE` prints the
+change per metric and exits 1 if any metric regressed by more than
+`--tolerance`. Metrics ending `_per_s` are higher-is-better; metrics ending
+`_s` are lower-is-better; anything else is informational. Baselines are
+machine-specific — record one on the machine you compare on:
+
+    uv run tools/bench-skills.py --out tools/bench-baseline.json
+    uv run tools/bench-skills.py --compare tools/bench-baseline.json
+
+The committed `tools/bench-baseline.json` is illustrative only: it was
+recorded on a single-CPU container (see its `meta.note`), so absolute numbers,
+and the concurrency sweep in particular, say little about other machines.
+`--compare` warns when the baseline's CPU count differs from this machine's.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+
+import typer
+from pinecone._internal.config import PineconeConfig
+from pinecone.models.assistant.chat import ChatUsage
+from pinecone.models.assistant.context import ContextResponse, FileReference, TextSnippet
+from pinecone.models.assistant.file_model import AssistantFileModel
+from pinecone.models.assistant.model import AssistantModel
+from pinecone.preview.documents import PreviewDocuments
+from pinecone.preview.models.documents import PreviewDocumentUpsertResponse
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+from typer.testing import CliRunner
+
+REPO = Path(__file__).resolve().parent.parent
+TOOLS = REPO / "tools"
+FTS_SCRIPTS = REPO / "skills" / "pinecone-full-text-search" / "scripts"
+ASSISTANT_SCRIPTS = REPO / "skills" / "pinecone-assistant" / "scripts"
+
+# Problem sizes per --scale. "small" runs in about a minute; "large" is for
+# checking tuning advice, not for every change.
+SCALES = {
+    "small": {"docs": 4_000, "upload_docs": 3_000, "tree_files": 4_000, "remote_files": 200, "assistants": 10},
+    "large": {"docs": 40_000, "upload_docs": 20_000, "tree_files": 40_000, "remote_files": 1_000, "assistants": 25},
+}
+
+CORPUS_SHAPES = {"text": 0, "dense768": 768, "dense3072": 3072}
+WORDS = ("pinecone index vector search query document field schema token batch "
+         "namespace upsert sparse dense filter score rerank lexical semantic hybrid").split()
+
+app = typer.Typer(add_completion=False)
+console = Console()
+
+
+# ---------------------------------------------------------------------------
+# Harness
+# ---------------------------------------------------------------------------
+
+def load_script(path: Path) -> ModuleType:
+    """Import a skill script as a module, without running its CLI."""
+    sys.path.insert(0, str(path.parent))  # sibling imports, e.g. sync.py -> assistant_io.py
+    spec = importlib.util.spec_from_file_location(path.stem.replace("-", "_"), path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # dataclasses look their module up by name
+    spec.loader.exec_module(module)
+    return module
+
+
+@contextlib.contextmanager
+def quiet():
+    """Swallow the scripts' progress output so it doesn't skew or clutter timings."""
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        yield
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> tuple[float, object]:
+    """Fastest wall-clock time of `repeat` calls, and the last call's result."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+# ---------------------------------------------------------------------------
+# Generated inputs
+# ---------------------------------------------------------------------------
+
+def make_corpus(path: Path, n: int, dim: int, seed: int = 0) -> Path:
+    """Write `n` schema-plausible JSONL docs: a ~1 KB body, a year, and a `dim`-d vector if dim > 0."""
+    rng = random.Random(seed)
+    with path.open("w", encoding="utf-8") as f:
+        for i in range(n):
+            doc = {
+                "_id": f"doc-{i:07d}",
+                "title": " ".join(rng.choices(WORDS, k=6)),
+                "body": " ".join(rng.choices(WORDS, k=150)),
+                "year": float(rng.randint(1990, 2026)),
+            }
+            if dim:
+                doc["embedding"] = [round(rng.uniform(-1, 1), 6) for _ in range(dim)]
+            f.write(json.dumps(doc) + "\n")
+    return path
+
+
+def make_tree(root: Path, n_files: int, seed: int = 0) -> list[Path]:
+    """A docs-repo-shaped tree: nested dirs of .md/.txt/.json plus code and excluded dirs.
+
+    Roughly 70% of files are supported documents; the rest are code files or
+    live under node_modules / .git / build, which every scanner should prune.
+    """
+    rng = random.Random(seed)
+    docs: list[Path] = []
+    for i in range(n_files):
+        depth = rng.randint(1, 5)
+        parts = [f"d{rng.randint(0, 12)}" for _ in range(depth)]
+        roll = rng.random()
+        if roll < 0.10:
+            parts.insert(rng.randint(0, len(parts)), rng.choice(["node_modules", ".git", "build", "__pycache__"]))
+        elif roll < 0.30:
+            parts.append(f"f{i}.py")
+        else:
+            parts.append(f"f{i}{rng.choice(['.md', '.md', '.txt', '.json'])}")
+        if not parts[-1].startswith("f"):
+            parts.append(f"f{i}.md")
+        path = root.joinpath(*parts)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"# {i}\n" + " ".join(rng.choices(WORDS, k=rng.randint(20, 400))), encoding="utf-8")
+        if roll >= 0.30:
+            docs.append(path)
+    return docs
+
+
+# ---------------------------------------------------------------------------
+# Fake assistant backend (the shape of `pc.assistant` the assistant scripts use)
+# ---------------------------------------------------------------------------
+
+class FakeAssistant:
+    """One assistant's files. Every call costs `latency`; uploads take `processing` to become Available."""
+
+    def __init__(self, name: str, latency: float, processing: float):
+        self.name = name
+        self.latency = latency
+        self.processing = processing
+        self.files: dict[str, AssistantFileModel] = {}
+        self.calls = {"list_files": 0, "upload_file": 0, "delete_file": 0, "describe_file": 0, "context": 0}
+        self._ready_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._ids = 0
+
+    def _call(self, name: str) -> None:
+        with self._lock:
+            self.calls[name] += 1
+        time.sleep(self.latency)
+
+    def _refresh(self, file_id: str) -> AssistantFileModel:
+        f = self.files[file_id]
+        if f.status == "Processing" and time.time() >= self._ready_at[file_id]:
+            f.status, f.percent_done = "Available", 100.0
+        return f
+
+    def add(self, name: str, metadata: dict, size: int, status: str = "Available") -> AssistantFileModel:
+        with self._lock:
+            self._ids += 1
+            file_id = f"file-{self._ids:07d}"
+            self.files[file_id] = AssistantFileModel(
+                name=name, id=file_id, metadata=metadata, status=status, size=size,
+                percent_done=100.0 if status == "Available" else 0.0,
+            )
+            self._ready_at[file_id] = time.time() + self.processing
+        return self.files[file_id]
+
+    def list_files(self, filter: dict | None = None) -> list[AssistantFileModel]:
+        self._call("list_files")
+        with self._lock:
+            return [self._refresh(i) for i in list(self.files)]
+
+    def describe_file(self, file_id: str, include_url: bool = False) -> AssistantFileModel:
+        self._call("describe_file")
+        with self._lock:
+            return self._refresh(file_id)
+
+    def upload_file(self, file_path: str, metadata: dict | None = None, timeout: float | None = None, **kwargs):
+        self._call("upload_file")
+        f = self.add(Path(file_path).name, metadata or {}, Path(file_path).stat().st_size, "Processing")
+        if timeout is None or timeout > 0:
+            time.sleep(self.processing)  # the SDK polls until processing finishes
+        with self._lock:
+            return self._refresh(f.id)
+
+    def delete_file(self, file_id: str, timeout: float | None = None) -> None:
+        self._call("delete_file")
+        with self._lock:
+            self.files.pop(file_id, None)
+
+    def context(self, query: str | None = None, top_k: int | None = None, snippet_size: int | None = None, **kw):
+        self._call("context")
+        with self._lock:
+            files = list(self.files.values())[: top_k or 16]
+        snippets = [
+            TextSnippet(content=" ".join(WORDS) * 8, score=1.0 / (i + 1),
+                        reference=FileReference(file=f, pages=[1]))
+            for i, f in enumerate(files)
+        ]
+        return ContextResponse(snippets=snippets, usage=ChatUsage(prompt_tokens=0, completion_tokens=0, total_tokens=0))
+
+
+class FakeAssistantNamespace:
+    def __init__(self, latency: float, processing: float):
+        self.latency = latency
+        self.processing = processing
+        self.assistants: dict[str, FakeAssistant] = {}
+
+    def Assistant(self, assistant_name: str) -> FakeAssistant:  # noqa: N802 — mirrors the SDK
+        if assistant_name not in self.assistants:
+            self.assistants[assistant_name] = FakeAssistant(assistant_name, self.latency, self.processing)
+        return self.assistants[assistant_name]
+
+    def list_assistants(self) -> list[AssistantModel]:
+        time.sleep(self.latency)
+        return [AssistantModel(name=n, status="Ready", host="fake.local") for n in self.assistants]
+
+
+class FakeAssistantClient:
+    """Stands in for `Pinecone(...)` in the assistant scripts."""
+
+    def __init__(self, latency: float = 0.002, processing: float = 0.0):
+        self.assistant = FakeAssistantNamespace(latency, processing)
+
+    def __call__(self, *args, **kwargs) -> FakeAssistantClient:
+        return self  # the scripts call Pinecone(api_key=..., source_tag=...)
+
+
+def run_cli(module: ModuleType, args: list[str]) -> None:
+    """Invoke a script's typer app; raise if it exited non-zero."""
+    result = CliRunner().invoke(module.app, args, env={"PINECONE_API_KEY": "bench"}, catch_exceptions=False)
+    if result.exit_code:
+        raise RuntimeError(f"{module.__name__} {' '.join(args)} exited {result.exit_code}:\n{result.output[-2000:]}")
+
+
+# ---------------------------------------------------------------------------
+# Suites
+# ---------------------------------------------------------------------------
+
+def sdk_documents(backend=None) -> PreviewDocuments:
+    """The SDK's real documents client, with only its one HTTP call, `upsert`, swapped for `backend.upsert`.
+
+    Everything ingest could route through on the way — `batch_upsert`, its
+    shared executor, argument validation — is the SDK's own code. Nothing is
+    sent: the host doesn't resolve, and `upsert` never reaches the network.
+    """
+    docs = PreviewDocuments(config=PineconeConfig(api_key="bench", host="https://bench.invalid"),
+                            host="https://bench.invalid")
+    if backend is not None:
+        docs.upsert = backend.upsert
+    return docs
+
+
+def check_upsert_overlap(ingest: ModuleType, concurrency: int = 8, batches: int = 16, delay: float = 0.2) -> dict:
+    """Regression check: ingest's batches must overlap on the wire, going through the SDK's real documents client.
+
+    Only the HTTP-level `upsert` is stubbed, with a fixed `delay`. If ingest
+    routes batches through anything that serializes them — as `batch_upsert`'s
+    shared executor did — fewer than `concurrency` requests are ever in flight
+    and this raises, failing the run.
+    """
+    docs = sdk_documents()
+    lock = threading.Lock()
+    in_flight = {"now": 0, "peak": 0}
+
+    def slow_upsert(*, namespace: str, documents: list[dict]) -> PreviewDocumentUpsertResponse:
+        with lock:
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        time.sleep(delay)
+        with lock:
+            in_flight["now"] -= 1
+        return PreviewDocumentUpsertResponse(upserted_count=len(documents))
+
+    docs.upsert = slow_upsert
+    controller = ingest.RateController(concurrency, ingest.DEFAULT_BATCH_BYTES, adaptive=False)
+    items = [ingest.Batch([{"_id": f"doc-{i}", "body": "overlap"}], 40, 0, i, i + 1) for i in range(batches)]
+    t0 = time.perf_counter()
+    try:
+        with quiet():
+            ingest.upsert_batches(SimpleNamespace(documents=docs), "bench", iter(items), controller)
+    finally:
+        docs.close()
+    seconds = time.perf_counter() - t0
+    if in_flight["peak"] < concurrency:
+        raise RuntimeError(
+            f"ingest upserts don't overlap: at most {in_flight['peak']} of {concurrency} requests in flight, "
+            f"{seconds:.2f}s for {batches} x {delay}s batches"
+        )
+    return {"peak_in_flight": in_flight["peak"], "elapsed_s": round(seconds, 3)}
+
+
+def bench_ingest(tmp: Path, size: dict, repeat: int, latency: float) -> dict[str, dict]:
+    ingest = load_script(FTS_SCRIPTS / "ingest.py")
+    fake_index = load_script(TOOLS / "fake_index.py")
+    results: dict[str, dict] = {}
+
+    for shape, dim in CORPUS_SHAPES.items():
+        n = size["docs"] if dim < 3000 else size["docs"] // 4
+        path = make_corpus(tmp / f"corpus-{shape}.jsonl", n, dim)
+        mb = path.stat().st_size / 1e6
+        parse_s, records = best_of(repeat, lambda: list(ingest.iter_jsonl(path)))
+        batch_s, batches = best_of(repeat, lambda: list(ingest.iter_batches(records, 1000, ingest.DEFAULT_BATCH_BYTES)))
+        results[f"ingest.parse[{shape}]"] = {
+            "docs_per_s": round(n / parse_s), "mb_per_s": round(mb / parse_s, 1), "decoder": ingest.JSON_BACKEND,
+        }
+        results[f"ingest.batch[{shape}]"] = {
+            "docs_per_s": round(n / batch_s), "batches": len(batches),
+            "docs_per_batch": round(n / len(batches), 1),
+        }
+
+    results["ingest.overlap[c=8]"] = check_upsert_overlap(ingest)
+
+    # Upload sweep: what the fake says about batch size and concurrency. ingest
+    # talks to the SDK's documents client, which forwards each request to the
+    # fake, so a serialized path shows up as a peak_in_flight of 1.
+    records = list(ingest.iter_jsonl(make_corpus(tmp / "upload.jsonl", size["upload_docs"], 768, seed=1)))
+    spec = f"latency={latency},sigma=0.25,mb_s=40,capacity=8,lag=0.2,seed=7"
+    for batch_docs in (50, 200, 1000):
+        for concurrency in (1, 2, 4, 8):
+            for adaptive in (False, True):
+                fake = fake_index.FakePinecone.from_spec(spec).preview.index(name="bench")
+                idx = SimpleNamespace(documents=sdk_documents(fake.documents))
+                controller = ingest.RateController(concurrency, ingest.DEFAULT_BATCH_BYTES, adaptive)
+                batches = ingest.iter_batches(iter(records), batch_docs, lambda: controller.batch_bytes)
+                latencies: list[float] = []
+                t0 = time.perf_counter()
+                try:
+                    with quiet():
+                        ingest.upsert_batches(
+                            idx, "bench", batches, controller,
+                            on_ack=lambda batch, outcome: latencies.append(outcome.seconds),
+                        )
+                finally:
+                    idx.documents.close()
+                seconds = time.perf_counter() - t0
+                name = f"ingest.upload[b={batch_docs},c={concurrency}{',adaptive' if adaptive else ''}]"
+                stats = fake.documents.stats
+                if concurrency > 1 and not adaptive and stats["peak_in_flight"] < 2:
+                    raise RuntimeError(f"{name}: upserts never overlapped (peak 1 in flight)")
+                results[name] = {
+                    "docs_per_s": round(len(records) / seconds),
+                    "batch_p50_s": round(ingest.percentile(latencies, 0.5), 4),
+                    "batch_p95_s": round(ingest.percentile(latencies, 0.95), 4),
+                    "requests": stats["requests"],
+                    "throttled": stats["throttled"],
+                    "peak_in_flight": stats["peak_in_flight"],
+                }
+
+    # End to end through the CLI, with the fake index swapped in for the SDK
+    # client: 429s and 503s drive the retry loop and the AIMD controller.
+    spec = f"latency={latency},capacity=8,throttle=0.05,unavailable=0.05,lag=0.2,seed=11"
+    pc = fake_index.FakePinecone.from_spec(spec)
+    real_pinecone, ingest.Pinecone = ingest.Pinecone, lambda **kwargs: pc
+    t0 = time.perf_counter()
+    try:
+        run_cli(ingest, [
+            "--data", str(make_corpus(tmp / "cli.jsonl", 1000, 0, seed=2)), "--index", "bench", "--sentinel-field", "body",
+            "--batch-size", "10", "--checkpoint", str(tmp / "cli.checkpoint"), "--max-retries", "10",
+        ])
+    finally:
+        ingest.Pinecone = real_pinecone
+    stats = pc.preview.index(name="bench").documents.stats
+    if not stats["throttled"] or not stats["unavailable"]:
+        raise RuntimeError(f"ingest.cli: expected both 429s and 503s from the fake, got {stats}")
+    results["ingest.cli[throttle,503]"] = {
+        "wall_seconds": round(time.perf_counter() - t0, 2),
+        "requests": stats["requests"], "throttled": stats["throttled"], "unavailable": stats["unavailable"],
+    }
+
+    # Readiness polling: how long after the data is actually searchable do we notice?
+    for lag in (0.5, 2.0):
+        overshoot = {}
+        for label in ("backoff", "fixed5s"):
+            pc = fake_index.FakePinecone.from_spec(f"latency=0.001,lag={lag},lag_sigma=0,seed=3")
+            idx = pc.preview.index(name="bench")
+            idx.documents.batch_upsert(namespace="bench", documents=[r.doc for r in records[:100]], batch_size=100)
+            visible_at = max(at for _, at in idx.documents.store["bench"].values())
+            probe = ingest.fetch_probe(idx, "bench", [r.doc["_id"] for r in records[:100]])
+            t0 = time.time()
+            if label == "backoff":
+                with quiet():
+                    ingest.poll(probe, 60)
+            else:
+                while probe() < 1.0:
+                    time.sleep(5)
+            overshoot[label] = time.time() - max(visible_at, t0)
+        results[f"ingest.poll[lag={lag}s]"] = {
+            "overshoot_s": round(overshoot["backoff"], 3),
+            "fixed5s_overshoot": round(overshoot["fixed5s"], 3),
+        }
+    return results
+
+
+def bench_sync(tmp: Path, size: dict, repeat: int, latency: float, tree: tuple[Path, list[Path]]) -> dict[str, dict]:
+    sync = load_script(ASSISTANT_SCRIPTS / "sync.py")
+    root, docs = tree
+    scan_s, found = best_of(repeat, lambda: sync.find_files(root))
+    results = {"sync.scan": {"files_per_s": round(len(found) / scan_s), "scan_s": round(scan_s, 4), "files": len(found)}}
+
+    # Plan a sync where 90% of files are already uploaded (5% of those stale) and 2% were deleted locally.
+    client = FakeAssistantClient(latency=latency)
+    asst = client.assistant.Assistant("bench")
+    rng = random.Random(5)
+    for path in found:
+        if rng.random() < 0.9:
+            st = path.stat()
+            stale = rng.random() < 0.05
+            asst.add(path.name, {"file_path": str(path.relative_to(root)), "mtime": st.st_mtime,
+                                 "size": st.st_size + (1 if stale else 0)}, st.st_size)
+    for i in range(len(found) // 50):
+        asst.add(f"gone-{i}.md", {"file_path": f"gone/gone-{i}.md", "mtime": 0.0, "size": 1}, 1)
+    sync.Pinecone = client
+    plan_s, _ = best_of(repeat, lambda: run_cli(sync, ["-a", "bench", "-s", str(root), "--dry-run", "--delete-missing",
+                                                             "--no-manifest", "--no-hash-cache"]))
+    results["sync.plan"] = {"files_per_s": round(len(found) / plan_s), "plan_s": round(plan_s, 4), "remote": len(asst.files)}
+    return results
+
+
+def bench_upload(tmp: Path, size: dict, repeat: int, latency: float, tree: tuple[Path, list[Path]]) -> dict[str, dict]:
+    upload = load_script(ASSISTANT_SCRIPTS / "upload.py")
+    root, _ = tree
+    with quiet():
+        scan_s, found = best_of(
+            repeat, lambda: upload.find_files(str(root), upload.DEFAULT_PATTERNS, upload.DEFAULT_EXCLUDES)
+        )
+    return {"upload.discover": {"files_per_s": round(len(found) / scan_s), "scan_s": round(scan_s, 4), "files": len(found)}}
+
+
+def bench_assistant(tmp: Path, size: dict, repeat: int, latency: float) -> dict[str, dict]:
+    list_script = load_script(ASSISTANT_SCRIPTS / "list.py")
+    context = load_script(ASSISTANT_SCRIPTS / "context.py")
+    client = FakeAssistantClient(latency=latency)
+    for a in range(size["assistants"]):
+        asst = client.assistant.Assistant(f"asst-{a}")
+        for i in range(size["remote_files"]):
+            asst.add(f"f{i}.md", {"file_path": f"docs/f{i}.md", "mtime": 0.0, "size": 100}, 100)
+    list_script.Pinecone = context.Pinecone = client
+    list_s, _ = best_of(repeat, lambda: run_cli(list_script, ["--json", "--files"]))
+    calls = 20
+    context_s, _ = best_of(repeat, lambda: [run_cli(context, ["-a", "asst-0", "-q", "vector search", "-k", "16", "--json"])
+                                            for _ in range(calls)])
+    return {
+        "assistant.list": {"list_s": round(list_s, 4), "assistants": size["assistants"], "files": size["remote_files"]},
+        "assistant.context": {"calls_per_s": round(calls / context_s, 1), "call_s": round(context_s / calls, 4)},
+    }
+
+
+SUITES = ("ingest", "sync", "upload", "assistant")
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """Print a table of changes vs. `baseline`; return the names of regressed metrics."""
+    table = Table(show_header=True, header_style="bold cyan")
+    for col in ("Benchmark", "Metric", "Baseline", "Now", "Change"):
+        table.add_column(col)
+    regressions = []
+    for name, metrics in results.items():
+        for metric, now in metrics.items():
+            base = baseline.get(name, {}).get(metric)
+            if not isinstance(now, (int, float)) or not isinstance(base, (int, float)) or not base:
+                continue
+            if metric.endswith("_per_s"):
+                change, worse = now / base - 1, now < base * (1 - tolerance)
+            elif metric.endswith("_s"):
+                change, worse = base / now - 1 if now else 0.0, now > base * (1 + tolerance)
+            else:
+                continue
+            style = "red" if worse else "green" if change > tolerance else ""
+            table.add_row(escape(name), metric, f"{base:g}", f"{now:g}", f"[{style}]{change:+.0%}[/{style}]" if style else f"{change:+.0%}")
+            if worse:
+                regressions.append(f"{name} {metric}")
+    console.print(table)
+    return regressions
+
+
+@app.command()
+def main(
+    only: list[str] = typer.Option(list(SUITES), "--only", help=f"Suites to run: {', '.join(SUITES)}."),
+    scale: str = typer.Option("small", "--scale", help=f"Problem size: {', '.join(SCALES)}."),
+    repeat: int = typer.Option(3, "--repeat", min=1, help="Runs per CPU-bound measurement; the fastest counts."),
+    latency: float = typer.Option(0.01, "--latency", min=0.0, help="Fake backend per-request latency, seconds."),
+    out: Path = typer.Option(Path("bench-results.json"), "--out", "-o", help="Where to write results."),
+    baseline_path: Path | None = typer.Option(None, "--compare", exists=True, dir_okay=False,
+                                              help="Baseline results JSON to compare against."),
+    tolerance: float = typer.Option(0.25, "--tolerance", min=0.0, help="Allowed fractional slowdown per metric."),
+    note: str | None = typer.Option(None, "--note", help="Free text stored in the results' meta, e.g. where they were recorded."),
+):
+    """Run the benchmarks, write JSON results, and optionally compare them to a baseline."""
+    unknown = set(only) - set(SUITES)
+    if unknown or scale not in SCALES:
+        raise typer.BadParameter(f"unknown suite(s) {sorted(unknown)} or scale {scale!r}")
+    size = SCALES[scale]
+    results: dict[str, dict] = {}
+    t_start = time.time()
+    with tempfile.TemporaryDirectory(prefix="bench-skills-") as tmpdir:
+        tmp = Path(tmpdir)
+        tree = None
+        if {"sync", "upload"} & set(only):
+            console.print(f"[dim]Generating a {size['tree_files']:,}-file source tree ...[/dim]")
+            tree = (tmp / "tree", make_tree(tmp / "tree", size["tree_files"]))
+        for suite in SUITES:
+            if suite not in only:
+                continue
+            console.print(f"[bold]{suite}[/bold] ...")
+            if suite == "ingest":
+                results.update(bench_ingest(tmp, size, repeat, latency))
+            elif suite == "sync":
+                results.update(bench_sync(tmp, size, repeat, latency, tree))
+            elif suite == "upload":
+                results.update(bench_upload(tmp, size, repeat, latency, tree))
+            else:
+                results.update(bench_assistant(tmp, size, repeat, latency))
+
+    report = {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(), "platform": platform.platform(),
+            "cpus": os.cpu_count(), "scale": scale, "latency": latency, "repeat": repeat,
+            "seconds": round(time.time() - t_start, 1),
+            **({"note": note} if note else {}),
+        },
+        "results": results,
+    }
+    out.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    console.print(f"Wrote {len(results)} result(s) to {escape(str(out))} in {report['meta']['seconds']}s.")
+
+    if baseline_path is not None:
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        base_meta = baseline.get("meta", {})
+        if base_meta.get("scale") != scale:
+            console.print(f"[yellow]Baseline was recorded at scale {base_meta.get('scale')!r}, "
+                          f"this run is {scale!r}; comparisons may not be meaningful.[/yellow]")
+        if base_meta.get("cpus") != os.cpu_count():
+            console.print(f"[yellow]Baseline was recorded on {base_meta.get('cpus')} CPU(s), this machine has "
+                          f"{os.cpu_count()}; throughput and concurrency numbers won't carry over.[/yellow]")
+        if base_meta.get("note"):
+            console.print(f"[dim]Baseline note: {escape(base_meta['note'])}[/dim]")
+        regressions = compare(results, baseline.get("results", {}), tolerance)
+        if regressions:
+            console.print(f"[red]{len(regressions)} metric(s) regressed by more than {tolerance:.0%}:[/red]")
+            for r in regressions:
+                console.print(f"  • {escape(r)}")
+            raise typer.Exit(1)
+        console.print(f"[green]No regressions beyond {tolerance:.0%}.[/green]")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,343 @@
+"""In-process stand-in for a Pinecone preview document index — no network, no API key.
+
+Test tooling, not part of any skill: `bench-skills.py` swaps it in for the
+SDK client (by replacing `ingest.Pinecone` in-process, or by forwarding the
+SDK client's `upsert` to it), so the upsert pipeline, rate controller,
+retries and readiness polling can be benchmarked and regression-tested
+offline and reproducibly.
+
+It mimics the `pc.preview.index(name=...).documents` surface that ingest uses —
+`upsert`, `batch_upsert`, `search`, `fetch`, `delete` — and returns the SDK's
+own result types (`BatchResult`, `BatchError`, `ApiError`, `PreviewDocument...`),
+so code under test can't tell the difference by shape. `batch_upsert` also
+runs the way the SDK's does: each chunk is an `upsert` on one executor per
+index, shared by every caller, so code that leans on it serializes here just
+as it does against the real service. Behaviour is driven by SPEC, a
+comma-separated list of `key=value` settings:
+
+    latency=0.05    median seconds per request (lognormal)
+    sigma=0.3       lognormal shape; 0 makes latency fixed
+    mb_s=50         per-request transfer rate; adds payload_MB / mb_s seconds
+    capacity=16     concurrent requests the "server" takes before answering 429
+    throttle=0      probability a request is answered with 429
+    unavailable=0   probability a request is answered with a transient 503
+    fail=0          probability a request is rejected with a permanent 400
+    lag=1.0         median seconds from acknowledgement to searchable (lognormal)
+    lag_sigma=0.5   lognormal shape of the lag
+    warmup=0        seconds during which `pc.preview.index(...)` raises 404
+    schema=PATH     JSON schema returned by `indexes.describe` ({"fields": {...}})
+    seed=N          seed the random draws, for repeatable runs
+
+An empty SPEC (or `1`) uses the defaults. Example:
+
+    FakePinecone.from_spec("latency=0.02,throttle=0.05,unavailable=0.02,lag=3,seed=7")
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any
+
+import msgspec
+from pinecone import ApiError, PineconeValueError
+from pinecone.models.batch import BatchError, BatchResult
+from pinecone.preview.models.documents import (
+    PreviewDocument,
+    PreviewDocumentFetchResponse,
+    PreviewDocumentSearchResponse,
+    PreviewDocumentUpsertResponse,
+)
+
+
+@dataclass
+class FakeConfig:
+    """Knobs for `FakePinecone`; see the module docstring for what each one does."""
+    latency: float = 0.05
+    sigma: float = 0.3
+    mb_s: float = 50.0
+    capacity: int = 16
+    throttle: float = 0.0
+    unavailable: float = 0.0
+    fail: float = 0.0
+    lag: float = 1.0
+    lag_sigma: float = 0.5
+    warmup: float = 0.0
+    schema: str | None = None
+    seed: int | None = None
+
+    @classmethod
+    def from_spec(cls, spec: str) -> FakeConfig:
+        """Parse `key=value,key=value`. Unknown keys and bad values raise ValueError."""
+        types = {f.name: f.type for f in fields(cls)}
+        kwargs: dict[str, Any] = {}
+        for part in filter(None, (p.strip() for p in spec.split(","))):
+            if part == "1":
+                continue
+            key, sep, value = part.partition("=")
+            if not sep or key not in types:
+                raise ValueError(f"fake index setting {part!r}: expected one of {', '.join(types)} as key=value")
+            kind = types[key]
+            kwargs[key] = (
+                value if "str" in kind
+                else int(value) if kind.startswith("int")
+                else float(value)
+            )
+        return cls(**kwargs)
+
+
+def lognormal(rng: random.Random, median: float, sigma: float) -> float:
+    """A lognormal draw with the given median (0 stays 0)."""
+    if median <= 0:
+        return 0.0
+    return median * math.exp(rng.gauss(0.0, sigma)) if sigma > 0 else median
+
+
+class FakeDocuments:
+    """The `.documents` namespace of a fake index. Thread-safe."""
+
+    def __init__(self, config: FakeConfig, rng: random.Random):
+        self.config = config
+        self.rng = rng
+        # namespace -> _id -> (document, time it becomes searchable)
+        self.store: dict[str, dict[str, tuple[dict, float]]] = {}
+        self.stats = {
+            "requests": 0, "throttled": 0, "unavailable": 0, "failed": 0,
+            "documents": 0, "bytes": 0, "peak_in_flight": 0,
+        }
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._encode = msgspec.json.Encoder().encode
+        self._batch_executor: ThreadPoolExecutor | None = None
+        self._batch_executor_workers = 0
+
+    # -- writes -------------------------------------------------------------
+
+    def batch_upsert(
+        self,
+        *,
+        namespace: str,
+        documents: list[dict[str, Any]],
+        batch_size: int = 50,
+        max_concurrency: int | None = None,
+        show_progress: bool = True,
+        **kwargs: Any,
+    ) -> BatchResult:
+        """Split `documents` into `batch_size` chunks and `upsert` each on the shared executor.
+
+        Like the SDK, the executor belongs to this index and is rebuilt only
+        when `max_concurrency` (default 4) changes, so concurrent callers queue
+        behind each other's chunks. Each chunk independently succeeds, or fails
+        with 429 (over `capacity` or by `throttle` chance), 503 (by
+        `unavailable` chance) or a permanent 400 (by `fail` chance), exactly
+        as the SDK reports partial failures.
+        """
+        executor = self._get_batch_executor(max_concurrency or 4)
+        chunks = [documents[i : i + batch_size] for i in range(0, len(documents), batch_size)]
+        futures = [executor.submit(self.upsert, namespace=namespace, documents=chunk) for chunk in chunks]
+        errors: list[BatchError] = []
+        for n, (chunk, future) in enumerate(zip(chunks, futures)):
+            exc = future.exception()
+            if exc is not None:
+                errors.append(BatchError(batch_index=n, items=chunk, error=exc, error_message=str(exc)))
+        failed_items = sum(len(e.items) for e in errors)
+        return BatchResult(
+            total_item_count=len(documents),
+            successful_item_count=len(documents) - failed_items,
+            failed_item_count=failed_items,
+            total_batch_count=len(chunks),
+            successful_batch_count=len(chunks) - len(errors),
+            failed_batch_count=len(errors),
+            errors=errors,
+        )
+
+    def _get_batch_executor(self, max_concurrency: int) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._batch_executor is None or self._batch_executor_workers != max_concurrency:
+                if self._batch_executor is not None:
+                    self._batch_executor.shutdown(wait=False)
+                self._batch_executor = ThreadPoolExecutor(max_concurrency, thread_name_prefix="fake-batch-upsert")
+                self._batch_executor_workers = max_concurrency
+            return self._batch_executor
+
+    def upsert(self, *, namespace: str, documents: list[dict[str, Any]]) -> PreviewDocumentUpsertResponse:
+        """One request. Validates `_id`s client-side as the SDK does, then raises any simulated error."""
+        seen: set[str] = set()
+        for i, doc in enumerate(documents):
+            doc_id = doc.get("_id")
+            if not isinstance(doc_id, str) or not doc_id or doc_id in seen:
+                raise PineconeValueError(f"document at index {i} has a missing, non-string, empty or duplicate '_id'")
+            seen.add(doc_id)
+        exc = self._send(namespace, documents)
+        if exc is not None:
+            raise exc
+        return PreviewDocumentUpsertResponse(upserted_count=len(documents))
+
+    def _send(self, namespace: str, docs: list[dict]) -> ApiError | None:
+        """One simulated request: admission, latency, then the write. Returns the error, if any."""
+        payload = len(self._encode(docs))
+        with self._lock:
+            self.stats["requests"] += 1
+            busy = self._in_flight >= self.config.capacity
+            roll = self.rng.random()
+            delay = lognormal(self.rng, self.config.latency, self.config.sigma)
+            if busy or roll < self.config.throttle:
+                self.stats["throttled"] += 1
+                error = ApiError("Too Many Requests (fake index)", status_code=429)
+            elif roll < self.config.throttle + self.config.unavailable:
+                self.stats["unavailable"] += 1
+                error = ApiError("Service Unavailable (fake index)", status_code=503)
+            elif roll < self.config.throttle + self.config.unavailable + self.config.fail:
+                self.stats["failed"] += 1
+                error = ApiError("Bad Request: document rejected (fake index)", status_code=400)
+            else:
+                error = None
+                self._in_flight += 1
+                self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self._in_flight)
+        if error is not None:
+            time.sleep(delay / 4)  # rejections come back faster than writes
+            return error
+        try:
+            time.sleep(delay + payload / 1e6 / self.config.mb_s)
+            now = time.time()
+            with self._lock:
+                ns = self.store.setdefault(namespace, {})
+                for doc in docs:
+                    ns[doc["_id"]] = (doc, now + lognormal(self.rng, self.config.lag, self.config.lag_sigma))
+                self.stats["documents"] += len(docs)
+                self.stats["bytes"] += payload
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        return None
+
+    def delete(
+        self,
+        *,
+        namespace: str,
+        ids: list[str] | None = None,
+        delete_all: bool = False,
+        filter: dict[str, Any] | None = None,
+    ) -> None:
+        with self._lock:
+            ns = self.store.setdefault(namespace, {})
+            if delete_all:
+                ns.clear()
+                return
+            if not ids or len(ids) > 1000:
+                raise ApiError("Bad Request: ids must hold 1 to 1000 items (fake index)", status_code=400)
+            for doc_id in ids:
+                ns.pop(doc_id, None)
+
+    # -- reads --------------------------------------------------------------
+
+    def search(
+        self,
+        *,
+        namespace: str,
+        top_k: int,
+        score_by: list[dict[str, Any]],
+        include_fields: list[str] | None = None,
+        filter: dict[str, Any] | None = None,
+    ) -> PreviewDocumentSearchResponse:
+        """Token match on `text` score_by clauses, over documents whose lag has elapsed.
+
+        A document scores one point per query token found in the clause's
+        field. Filters and other score_by types are ignored.
+        """
+        clauses = [
+            (c["field"], set(str(c.get("query", "")).lower().split()))
+            for c in score_by if c.get("type", "text") == "text" and "field" in c
+        ]
+        now = time.time()
+        with self._lock:
+            visible = [doc for doc, at in self.store.get(namespace, {}).values() if at <= now]
+        scored = []
+        for doc in visible:
+            score = sum(
+                len(tokens & set(str(doc.get(field, "")).lower().split())) for field, tokens in clauses
+            )
+            if score:
+                scored.append((score, doc))
+        scored.sort(key=lambda pair: -pair[0])
+        matches = [
+            PreviewDocument({**self._project(doc, include_fields), "_score": float(score)})
+            for score, doc in scored[:top_k]
+        ]
+        return PreviewDocumentSearchResponse(matches=matches, namespace=namespace)
+
+    def fetch(
+        self,
+        *,
+        namespace: str,
+        ids: list[str] | None = None,
+        include_fields: list[str] | None = None,
+        filter: dict[str, Any] | None = None,
+    ) -> PreviewDocumentFetchResponse:
+        now = time.time()
+        with self._lock:
+            ns = self.store.get(namespace, {})
+            found = {i: ns[i][0] for i in ids or [] if i in ns and ns[i][1] <= now}
+        return PreviewDocumentFetchResponse(
+            documents={i: PreviewDocument(self._project(d, include_fields)) for i, d in found.items()},
+            namespace=namespace,
+        )
+
+    @staticmethod
+    def _project(doc: dict, include_fields: list[str] | None) -> dict:
+        if include_fields and "*" in include_fields:
+            return dict(doc)
+        return {"_id": doc["_id"], **{f: doc[f] for f in include_fields or [] if f in doc}}
+
+
+class FakeIndex:
+    def __init__(self, documents: FakeDocuments):
+        self.documents = documents
+
+
+class FakeIndexes:
+    """`pc.preview.indexes`; only `describe(name).schema` is implemented."""
+
+    def __init__(self, config: FakeConfig):
+        self.config = config
+
+    def describe(self, name: str):
+        schema = {"fields": {}}
+        if self.config.schema:
+            schema = json.loads(Path(self.config.schema).read_text(encoding="utf-8"))
+        return type("FakeIndexModel", (), {"name": name, "schema": schema})()
+
+
+class FakePreview:
+    def __init__(self, config: FakeConfig, rng: random.Random):
+        self.config = config
+        self.indexes = FakeIndexes(config)
+        self._rng = rng
+        self._created = time.time()
+        self._indexes: dict[str, FakeIndex] = {}
+
+    def index(self, *, name: str, **kwargs: Any) -> FakeIndex:
+        """The named fake index (created on first use); 404 until `warmup` seconds have passed."""
+        if time.time() - self._created < self.config.warmup:
+            raise ApiError(f"Index {name!r} not found (fake index warming up)", status_code=404)
+        if name not in self._indexes:
+            self._indexes[name] = FakeIndex(FakeDocuments(self.config, self._rng))
+        return self._indexes[name]
+
+
+class FakePinecone:
+    """Drop-in for `Pinecone(...)` as far as the full-text-search scripts use it."""
+
+    def __init__(self, config: FakeConfig | None = None, **kwargs: Any):
+        self.config = config or FakeConfig()
+        self.preview = FakePreview(self.config, random.Random(self.config.seed))
+
+    @classmethod
+    def from_spec(cls, spec: str) -> FakePinecone:
+        return cls(FakeConfig.from_spec(spec))